@@ -0,0 +1,45 @@
+"""Benchmark the bookkeeping that `youtube.load` does for each finished request.
+
+Run from the repository root:
+
+    $ python -m benchmarks.dispatch
+
+The network is not used: every URL is "completed" with a tiny payload in random order, so the
+timings only include building the URL index and dispatching the results. The time per URL should
+stay flat as the batch grows.
+
+"""
+import json
+import random
+import time
+
+from youtube import utils
+
+SIZES = (1000, 5000, 10000, 50000)
+PAYLOAD = b'title=Title&length_seconds=100'
+
+
+def dispatch(size):
+    identifiers = ['{0:011d}'.format(n) for n in range(size)]
+
+    start = time.perf_counter()
+    data, index = utils._urls(identifiers, video=True, playlist=False)
+    urls = list(index)
+    random.shuffle(urls)
+
+    for url in urls:
+        utils._store(data, index, url, PAYLOAD)
+
+    return time.perf_counter() - start, len(urls)
+
+
+def main():
+    for size in SIZES:
+        elapsed, urls = dispatch(size)
+        print(json.dumps(dict(benchmark='dispatch', videos=size, urls=urls,
+                              seconds=round(elapsed, 6),
+                              us_per_url=round(elapsed / urls * 1e6, 3))))
+
+
+if __name__ == '__main__':
+    main()
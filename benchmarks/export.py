@@ -0,0 +1,71 @@
+"""Benchmark serializing videos with `json.dumps(video.__dict__)` and with `youtube.export`.
+
+Run from the repository root:
+
+    $ python -m benchmarks.export
+
+The videos are built from `benchmarks.fixtures` and all of their fields are extracted before the
+timings, so only the serialization is measured. Reading the binary records back decodes one
+field per record.
+
+"""
+import io
+import json
+import time
+from urllib import parse
+
+from benchmarks import fixtures
+from youtube import export
+from youtube.video import Video
+
+VIDEOS = 2000
+
+
+def videos():
+    info = fixtures.info('id')
+    html = fixtures.html('id', size=10000).encode('utf-8')
+    result = []
+    for n in range(VIDEOS):
+        identifier = '{0:011d}'.format(n)
+        video = Video(identifier=identifier, data=dict(info=dict(parse.parse_qsl(info)),
+                                                        html=html))
+        video.__getstate__()  # Only the extracted fields are kept.
+        result.append(video)
+    return result
+
+
+def dumps(videos, file):
+    for video in videos:
+        file.write((json.dumps(video.__dict__) + '\n').encode('utf-8'))
+
+
+def write(writer, videos, file):
+    with writer(file) as output:
+        output.writemany(videos)
+
+
+def main():
+    items = videos()
+    for name, function in (('json.dumps', dumps),
+                           ('jsonl', lambda items, file: write(export.JSONLinesWriter, items,
+                                                               file)),
+                           ('binary', lambda items, file: write(export.BinaryWriter, items,
+                                                                file))):
+        file = io.BytesIO()
+        start = time.perf_counter()
+        function(items, file)
+        elapsed = time.perf_counter() - start
+        print(json.dumps(dict(benchmark='export', method=name, videos=VIDEOS,
+                              bytes_per_video=len(file.getvalue()) // VIDEOS,
+                              us_per_video=round(elapsed / VIDEOS * 1e6, 1))))
+
+    file.seek(0)
+    start = time.perf_counter()
+    titles = [record.title for record in export.read(file)]
+    elapsed = time.perf_counter() - start
+    print(json.dumps(dict(benchmark='export', method='read', videos=len(titles),
+                          us_per_video=round(elapsed / VIDEOS * 1e6, 1))))
+
+
+if __name__ == '__main__':
+    main()
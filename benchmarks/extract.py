@@ -0,0 +1,66 @@
+"""Benchmark extracting the HTML fields of a video from the watch page.
+
+Run from the repository root:
+
+    $ python -m benchmarks.extract
+
+Compares the extractor with the previous approach of one uncompiled `re.search` per field (and
+two per field for `player` and `streams`, which both read the player), and decoding the response
+before extracting with searching its bytes.
+
+"""
+import json
+import re
+import timeit
+from urllib import parse
+
+from benchmarks import fixtures
+from youtube.video import VideoInfoExtractor
+
+NUMBER = 50
+SIZES = (100000, 400000, 800000)
+
+
+def baseline(html):
+    re.search(r'itemprop="datePublished" content="(.*)">', html)
+    re.search('<p id="eow-description" class="" >(.*)</p>', html)
+    re.search(r'"genre" content="(.*)"', html)
+    re.search(r'Standard YouTube License|Creative Commons - Attribution', html)
+    re.search(r'like this video along with (.*) other', html)
+    re.search(r'dislike this video along with (.*) other', html)
+    re.search(r'yt-subscriber-count" title="(.*)" aria-label', html)
+    for _ in range(2):
+        re.search(r'"sts":(\d+)', html)
+        re.search(r'"js":"\\/(.*base\.js)"', html)
+
+
+INFO = dict(parse.parse_qsl(fixtures.info('id')))
+
+
+def extract(html):
+    extractor = VideoInfoExtractor('id', {'id': dict(info=INFO, html=html)})
+    extractor.date()
+    extractor.description()
+    extractor.category()
+    extractor.license()
+    extractor.statistics()
+    extractor.channel()
+    extractor.player()
+    extractor.player()
+
+
+def main():
+    for size in SIZES:
+        html = fixtures.html('id', size=size)
+        body = html.encode('utf-8')
+        for name, function in (('baseline', lambda: baseline(html)),
+                               ('extract', lambda: extract(html)),
+                               ('decode_extract', lambda: extract(body.decode('utf-8'))),
+                               ('extract_bytes', lambda: extract(body))):
+            seconds = timeit.timeit(function, number=NUMBER) / NUMBER
+            print(json.dumps(dict(benchmark='extract', method=name, size=len(html),
+                                  ms_per_page=round(seconds * 1e3, 3))))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""Synthetic YouTube responses shaped like the pages `youtube.video.VideoInfoExtractor` parses.
+
+The repository does not ship captured pages, so the benchmarks build them here: a watch page
+padded with boilerplate to a realistic size, a `get_video_info` query string with signed
+adaptive and multiplexed formats and a caption track, a `list_ajax` playlist page, a stub
+player whose cipher is the one of `STS`, a timed-text caption track and thumbnail sizes.
+
+"""
+import json
+import zlib
+from urllib import parse
+
+# The cipher 's3 r7 w49' for the player with sts 17561 from youtube/data/ciphers.json.
+STS = '17561'
+SIGNATURE = ('76D76D93CC670CDC94B23703E52E298ECA620E69BE4.'
+             '03CD2DF6066391A54D7D96089F98CCB51D8912A6')
+
+BOILERPLATE = '<div class="yt-uix-boilerplate">{0}</div>\n'.format('x' * 80)
+
+
+def html(identifier, size=400000):
+    """Build the watch page https://www.youtube.com/watch?v=... of about `size` characters."""
+    padding = BOILERPLATE * (size // len(BOILERPLATE) // 2)
+    return ''.join([
+        '<!DOCTYPE html><html><head><title>', identifier, '</title></head><body>\n',
+        padding,
+        '<script>var ytplayer = {"args":{"sts":', STS, '},',
+        '"assets":{"js":"\\/yts\\/jsbin\\/player-vflvideo\\/en_US\\/base.js"}};</script>\n',
+        '<meta itemprop="datePublished" content="2013-02-26">\n',
+        '<meta itemprop="genre" content="Education">\n',
+        '<span class="yt-subscriber-count" title="203K" aria-label="203K">203K</span>\n',
+        '<button aria-label="like this video along with 115,618 other people">\n',
+        '<button aria-label="dislike this video along with 3,549 other people">\n',
+        '<p id="eow-description" class="" >Learn about a new "superpower".<br />Visit ',
+        '<a href="/redirect?event=video_description&amp;q=http%3A%2F%2Fwww.code.org" ',
+        'rel="nofollow">http://www.code.org...</a><br />Watch <a href="/watch?v=n_KghQP86Sw">',
+        'https://www.youtube.com/watch?v=n_KghQP86Sw</a></p>\n',
+        '<ul class="watch-info-tag-list"><li>Standard YouTube License</li></ul>\n',
+        padding,
+        '</body></html>'])
+
+
+def info(identifier, streams=12, host='https://www.youtube.com'):
+    """Build the query string returned by https://www.youtube.com/get_video_info?..."""
+    url = 'https://r1.googlevideo.com/videoplayback?id={0}&itag={1}'
+
+    adaptive = []
+    for n in range(streams):
+        itag = str(130 + n)
+        stream = dict(itag=itag, url=url.format(identifier, itag), s=SIGNATURE,
+                      bitrate=str(100000 * (n + 1)), clen=str(1000000 * (n + 1)))
+        if n % 2 == 0:
+            stream.update(type='video/mp4; codecs="avc1.4d401f"',
+                          quality_label='{0}p'.format(144 * (n // 2 + 1)), fps='30')
+        else:
+            stream.update(type='audio/mp4; codecs="mp4a.40.2"')
+        adaptive.append(parse.urlencode(stream))
+
+    multiplexed = []
+    for itag, quality, fmt in (('22', 'hd720', 'video/mp4; codecs="avc1.64001F, mp4a.40.2"'),
+                               ('18', 'medium', 'video/mp4; codecs="avc1.42001E, mp4a.40.2"'),
+                               ('43', 'medium', 'video/webm; codecs="vp8.0, vorbis"')):
+        multiplexed.append(parse.urlencode(dict(itag=itag, quality=quality, type=fmt,
+                                                url=url.format(identifier, itag), s=SIGNATURE)))
+
+    track = dict(baseUrl='{0}/api/timedtext?v={1}&lang=en'.format(host, identifier),
+                 name=dict(simpleText='English'), languageCode='en')
+    player_response = dict(captions=dict(
+        playerCaptionsTracklistRenderer=dict(captionTracks=[track])))
+
+    return parse.urlencode(dict(
+        title='Video {0}'.format(identifier), length_seconds='344',
+        keywords='code,Mark Zuckerberg,Computer Science', avg_rating='4.8812',
+        view_count='14134818', allow_ratings='1', author='Code.org',
+        ucid='UCJyEBMU1xVP2be1-AoGS1BA', adaptive_fmts=','.join(adaptive),
+        url_encoded_fmt_stream_map=','.join(multiplexed),
+        player_response=json.dumps(player_response)))
+
+
+def base_js(size=100000):
+    """Build the player base.js with the functions `youtube.ciphers.find` looks for."""
+    padding = 'var yt={0};\n'.format('0' * 80) * (size // 88 // 2)
+    return ''.join([
+        padding,
+        'var CK={XN:function(a,b){var c=a[0];a[0]=a[b%a.length];a[b]=c},\n',
+        'AE:function(a){a.reverse()},\n',
+        'ng:function(a,b){a.splice(0,b)}};\n',
+        'DK=function(a){a=a.split("");CK.ng(a,3);CK.AE(a,7);CK.XN(a,49);return a.join("")};\n',
+        'c.set("signature",DK(e));\n',
+        padding])
+
+
+def playlist(identifier, index=1, total=450, page=200):
+    """Build the page https://www.youtube.com/list_ajax?...&index=... of a playlist.
+
+    The videos are 'v0001', 'v0002', ... and each page has `page` of them starting at `index`.
+
+    """
+    videos = [dict(encrypted_id='v{0:04d}'.format(n), title='Video {0}'.format(n))
+              for n in range(index, min(index + page, total + 1))]
+    return json.dumps(dict(title='Playlist {0}'.format(identifier), author='Code.org',
+                           description='', views=total * 1000, video=videos))
+
+
+def timedtext(identifier, cues=600):
+    """Build the caption track https://www.youtube.com/api/timedtext?v=...&lang=en."""
+    lines = ['<?xml version="1.0" encoding="utf-8" ?><transcript>']
+    for n in range(cues):
+        lines.append('<text start="{0:.2f}" dur="{1:.2f}">Cue {2} of {3}: it&amp;#39;s a '
+                     'line of the transcript</text>'.format(n * 2.5, 2.4, n, identifier))
+    lines.append('</transcript>')
+    return '\n'.join(lines)
+
+
+def thumbnail(identifier, filename):
+    """Return the size of the thumbnail https://i.ytimg.com/vi/ID/FILENAME, or None if it is
+    missing. The 'standard' and 'maxres' thumbnails are missing for a third of the videos.
+
+    """
+    if filename in ('sddefault.jpg', 'maxresdefault.jpg') and zlib.crc32(
+            identifier.encode('utf-8')) % 3 == 0:
+        return None
+    return 1000 + len(filename) * 997
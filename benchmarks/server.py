@@ -0,0 +1,184 @@
+"""A local stand-in for YouTube that serves the responses built by `benchmarks.fixtures`.
+
+Example:
+
+    with Server(latency=0.02) as host:
+        youtube.utils.HOST = host
+        data = youtube.load(identifiers, video=True)
+
+"""
+import functools
+import gzip
+import http.server
+import re
+import threading
+import time
+from urllib import parse
+
+from benchmarks import fixtures
+
+BLOCK_SIZE = 2 ** 16
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like YouTube.
+    disable_nagle_algorithm = True  # The headers and body are written separately.
+
+    def do_GET(self):
+        parts = parse.urlsplit(self.path)
+        query = dict(parse.parse_qsl(parts.query))
+
+        if parts.path == '/videoplayback':
+            self._media(int(query['clen']))
+            return
+
+        if parts.path == '/watch':
+            body = _html(query['v'])
+        elif parts.path == '/get_video_info':
+            body = _info(query['video_id'], self.server.host)
+        elif parts.path == '/list_ajax':
+            body = _playlist(query['list'], int(query.get('index', 1)))
+        elif parts.path == '/api/timedtext':
+            body = fixtures.timedtext(query['v']).encode('utf-8')
+        elif parts.path.endswith('/base.js'):
+            body = _base_js()
+        else:
+            self.send_error(404)
+            return
+
+        # The round trip to YouTube, the handler threads sleep concurrently.
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        self.send_response(200)
+        if self.server.compress and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body, compresslevel=1)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        parts = parse.urlsplit(self.path)
+        query = dict(parse.parse_qsl(parts.query))
+        if parts.path.startswith('/vi/'):
+            size = fixtures.thumbnail(*parts.path.split('/')[2:4])
+        elif parts.path == '/videoplayback':
+            size = int(query['clen'])
+        else:
+            size = None
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        if size is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Length', str(size))
+        self.send_header('Accept-Ranges', 'bytes')
+        self.end_headers()
+
+    def _media(self, size):
+        """Serve the stream of `size` bytes, or the requested range of it."""
+        start, end = 0, size - 1
+        match = re.match(r'bytes=(\d+)-(\d*)$', self.headers.get('Range', ''))
+        if match:
+            start = int(match.group(1))
+            end = min(int(match.group(2)), end) if match.group(2) else end
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        self.send_response(206 if match else 200)
+        self.send_header('Content-Length', str(end - start + 1))
+        if match:
+            self.send_header('Content-Range', 'bytes {0}-{1}/{2}'.format(start, end, size))
+        self.end_headers()
+
+        # Each connection is throttled to `bandwidth` like the video servers do.
+        data = memoryview(_media(size))[start:end + 1]
+        try:
+            for offset in range(0, len(data), BLOCK_SIZE):
+                self.wfile.write(data[offset:offset + BLOCK_SIZE])
+                if self.server.bandwidth:
+                    time.sleep(BLOCK_SIZE / self.server.bandwidth)
+        except ConnectionError:
+            self.close_connection = True  # The client stopped the download.
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(object):
+    """Serve the fixtures on a random local port in a background thread.
+
+    Args:
+        latency (float): The number of seconds each response is delayed by.
+        bandwidth (int): The maximum number of bytes per second sent by each connection to
+            `/videoplayback?clen=...`. Default to None, without the limit.
+        compress (bool): If True, the pages are gzipped for the clients that accept it. The
+            stream is never compressed.
+
+    """
+
+    def __init__(self, latency=0, bandwidth=None, compress=True):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.compress = compress
+        self._server = None
+
+    def start(self):
+        """Start the server and return its address, to be used as `youtube.utils.HOST`."""
+        self._server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._server.latency = self.latency
+        self._server.bandwidth = self.bandwidth
+        self._server.compress = self.compress
+        self._server.host = 'http://127.0.0.1:{0}'.format(self._server.server_port)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server.host
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+# The large responses are built once, so serving them costs the benchmarked client little CPU.
+
+@functools.lru_cache(maxsize=None)
+def _template():
+    return fixtures.html('\0').encode('utf-8').split(b'\0')
+
+
+def _html(identifier):
+    return identifier.encode('utf-8').join(_template())
+
+
+def _info(identifier, host):
+    return fixtures.info(identifier, host=host).encode('utf-8')
+
+
+@functools.lru_cache(maxsize=None)
+def _playlist(identifier, index):
+    return fixtures.playlist(identifier, index).encode('utf-8')
+
+
+@functools.lru_cache(maxsize=4)
+def _media(size):
+    # The byte at each offset is offset % 251, so misplaced ranges are detected.
+    return (bytes(range(251)) * (size // 251 + 1))[:size]
+
+
+@functools.lru_cache(maxsize=None)
+def _base_js():
+    return fixtures.base_js().encode('utf-8')
@@ -0,0 +1,199 @@
+"""Benchmark loading, parsing and deciphering against a local stand-in for YouTube.
+
+Run from the repository root:
+
+    $ python -m benchmarks.suite > results.jsonl
+
+The network is not used: `benchmarks.server` serves the watch pages, `get_video_info` payloads,
+`list_ajax` pages, caption tracks, thumbnails and the player from `benchmarks.fixtures`, with
+`LATENCY` seconds added to each response, and a stream throttled to `BANDWIDTH` per connection.
+Each result is printed as a line of JSON, compare them between revisions to track regressions.
+
+"""
+import gc
+import json
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks import fixtures
+from benchmarks.server import Server, _media
+from youtube import captions, ciphers, thumbnails, utils, video
+from youtube.download import download
+from youtube.playlist import Playlist
+from youtube.streams import Stream
+from youtube.video import Video
+
+LATENCY = 0.02
+VIDEOS = 100
+MAX_WORKERS = (1, 4, 16, 64)
+SIGNATURES = 100000
+STREAM_SIZE = 2 ** 24
+BANDWIDTH = 2 ** 22  # Per connection.
+DOWNLOAD_WORKERS = (1, 4, 8)
+
+
+def load_throughput(max_workers):
+    # New identifiers for each run, so nothing is reused from the previous one.
+    identifiers = ['w{0:02d}v{1:06d}'.format(max_workers, n) for n in range(VIDEOS)]
+
+    start = time.perf_counter()
+    data = utils.load(identifiers, video=True, max_workers=max_workers, raw=True)
+    elapsed = time.perf_counter() - start
+
+    size = sum(len(body) for value in data.values() for body in value.values())
+    return dict(benchmark='load', max_workers=max_workers, videos=VIDEOS, latency=LATENCY,
+                seconds=round(elapsed, 6), videos_per_second=round(VIDEOS / elapsed, 1),
+                mb_per_second=round(size / elapsed / 2 ** 20, 1))
+
+
+def parse_latency(data):
+    latencies = []
+    for identifier, value in data.items():
+        start = time.perf_counter()
+        Video(identifier=identifier, data=value).__dict__
+        latencies.append(time.perf_counter() - start)
+
+    latencies.sort()
+    return dict(benchmark='parse', videos=len(latencies),
+                ms_mean=round(statistics.mean(latencies) * 1e3, 3),
+                ms_p50=round(latencies[len(latencies) // 2] * 1e3, 3),
+                ms_p90=round(latencies[len(latencies) * 9 // 10] * 1e3, 3))
+
+
+def decipher_throughput():
+    cipher = ciphers.registry()[fixtures.STS]
+
+    start = time.perf_counter()
+    for _ in range(SIGNATURES):
+        ciphers.decipher(fixtures.SIGNATURE, cipher)
+    elapsed = time.perf_counter() - start
+
+    return dict(benchmark='decipher', signatures=SIGNATURES, seconds=round(elapsed, 6),
+                signatures_per_second=round(SIGNATURES / elapsed))
+
+
+def cipher_find(data):
+    identifier = next(iter(data))
+    url = Video(identifier=identifier, data=data[identifier], fields=('player',)).player['url']
+
+    start = time.perf_counter()
+    cipher = ciphers.find(url)
+    elapsed = time.perf_counter() - start
+
+    assert cipher == ciphers.registry()[fixtures.STS], cipher
+    return dict(benchmark='cipher_find', ms=round(elapsed * 1e3, 3))
+
+
+def memory(data, fields=None):
+    # The videos keep the responses until all of the fields are extracted, whatever they still
+    # hold is part of the size. `data` was allocated before tracing started, so each video gets a
+    # copy of its responses made while tracing.
+    gc.collect()
+    tracemalloc.start()
+
+    videos = []
+    for identifier, value in data.items():
+        value = {kind: bytes(memoryview(body)) for kind, body in value.items()}
+        video = Video(identifier=identifier, data=value, fields=fields)
+        video.__getstate__()  # Extract all of the fields.
+        videos.append(video)
+
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return dict(benchmark='memory', fields=fields, videos=len(videos),
+                kb_per_video=round(size / len(videos) / 1024, 1))
+
+
+def playlist_throughput():
+    start = time.perf_counter()
+    entries = sum(1 for _ in Playlist(identifier='PLbenchmark').entries())
+    elapsed = time.perf_counter() - start
+
+    return dict(benchmark='playlist', entries=entries, latency=LATENCY,
+                seconds=round(elapsed, 6))
+
+
+def captions_throughput(data):
+    videos = [Video(identifier=identifier, data=value, fields=('captions',))
+              for identifier, value in data.items()]
+
+    start = time.perf_counter()
+    cues = sum(len(track) for _, _, track in captions.iter_captions(videos, max_workers=16))
+    elapsed = time.perf_counter() - start
+
+    return dict(benchmark='captions', tracks=len(videos), cues=cues, latency=LATENCY,
+                seconds=round(elapsed, 6), tracks_per_second=round(len(videos) / elapsed, 1))
+
+
+def thumbnails_throughput(host):
+    video.THUMBNAIL = host + '/vi/{0}/{1}'
+    identifiers = ['t{0:06d}'.format(n) for n in range(VIDEOS)]
+
+    start = time.perf_counter()
+    results = thumbnails.iter_thumbnails(identifiers, max_workers=64)
+    found = sum(len(existing) for _, existing in results)
+    elapsed = time.perf_counter() - start
+
+    # The second pass is answered from memory.
+    start = time.perf_counter()
+    for _ in thumbnails.iter_thumbnails(identifiers):
+        pass
+    cached = time.perf_counter() - start
+
+    return dict(benchmark='thumbnails', videos=len(identifiers), found=found, latency=LATENCY,
+                seconds=round(elapsed, 6), cached_seconds=round(cached, 6))
+
+
+def download_throughput(host, workers):
+    url = '{0}/videoplayback?id=benchmark&itag=137&clen={1}'.format(host, STREAM_SIZE)
+    stream = Stream(137, 'video', 'mp4', 'avc1.640028', url, '1080p', 4000000, 30, STREAM_SIZE)
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        path = download(stream, os.path.join(directory, 'video.mp4'), workers=workers,
+                        chunk_size=STREAM_SIZE // 16)
+        elapsed = time.perf_counter() - start
+
+        # A range written at the wrong offset does not match the pattern of the stream.
+        with open(path, 'rb') as file:
+            assert file.read() == _media(STREAM_SIZE), 'The downloaded stream is corrupt.'
+
+    return dict(benchmark='download', workers=workers, size=STREAM_SIZE,
+                bandwidth_per_connection=BANDWIDTH, seconds=round(elapsed, 6),
+                mb_per_second=round(STREAM_SIZE / elapsed / 2 ** 20, 1))
+
+
+def main():
+    with Server(latency=LATENCY, bandwidth=BANDWIDTH) as host:
+        utils.HOST = host
+
+        for max_workers in MAX_WORKERS:
+            print(json.dumps(load_throughput(max_workers)))
+
+        identifiers = ['p{0:06d}'.format(n) for n in range(VIDEOS)]
+        data = utils.load(identifiers, video=True, raw=True)
+
+        print(json.dumps(parse_latency(data)))
+        print(json.dumps(decipher_throughput()))
+        print(json.dumps(cipher_find(data)))
+        print(json.dumps(memory(data)))
+
+        # Only get_video_info is loaded for these fields.
+        fields = ('title', 'duration', 'statistics')
+        data = utils.load(identifiers, video=True, raw=True, fields=fields)
+        print(json.dumps(memory(data, fields=fields)))
+        print(json.dumps(playlist_throughput()))
+        print(json.dumps(captions_throughput(data)))
+        print(json.dumps(thumbnails_throughput(host)))
+
+        for workers in DOWNLOAD_WORKERS:
+            print(json.dumps(download_throughput(host, workers)))
+
+
+if __name__ == '__main__':
+    main()
@@ -13,4 +13,5 @@ setup(
 
     packages=['youtube'],
     package_data={'youtube': ['data/ciphers.json']},
+    entry_points={'console_scripts': ['youtube-crawl = youtube.crawl:main']},
 )
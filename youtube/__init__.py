@@ -1,4 +1,9 @@
-__all__ = ['load', 'Video']
+__all__ = ['load', 'load_async', 'iter_load', 'iter_videos', 'Cache', 'Failure', 'FetchError',
+           'Metrics', 'Playlist', 'Scheduler', 'Video', 'refresh']
 
-from .utils import load
-from .video import Video
+from .aio import load_async
+from .cache import Cache
+from .metrics import Metrics
+from .playlist import Playlist
+from .utils import Failure, FetchError, Scheduler, load, iter_load
+from .video import Video, iter_videos, refresh
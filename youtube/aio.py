@@ -0,0 +1,164 @@
+import asyncio
+import http.client
+import ssl
+from urllib import error, parse
+
+from youtube import metrics, utils
+from youtube.pool import BLOCK_SIZE, ENCODINGS, Decompressor
+from youtube.utils import _failure, _kinds, _lookup, _store, _urls
+
+
+class Client(object):
+    """A minimal non-blocking HTTP/1.1 client built on top of asyncio streams.
+
+    Args:
+        max_concurrency (int): The maximum number of requests in flight at the same time.
+        timeout (float): The number of seconds to wait for a single response.
+
+    Note:
+        The client must be created inside a running event loop.
+
+    """
+
+    def __init__(self, max_concurrency=100, timeout=30):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.context = ssl.create_default_context()
+        self.timeout = timeout
+
+    async def get(self, url, redirects=5):
+        """Fetch the URL and return the body of the response as bytes."""
+        async with self.semaphore:
+            with metrics.measure('request', parse.urlsplit(url).path) as event:
+                status, reason, headers, body = await asyncio.wait_for(self._request(url),
+                                                                       self.timeout)
+                event.status, event.size = status, len(body)
+
+        if status in (301, 302, 303, 307, 308) and 'location' in headers and redirects > 0:
+            return await self.get(parse.urljoin(url, headers['location']), redirects - 1)
+
+        if status >= 400:
+            # Case-insensitive headers, e.g. for the Retry-After of the scheduler.
+            message = http.client.HTTPMessage()
+            for name, value in headers.items():
+                message[name] = value
+            raise error.HTTPError(url, status, reason, message, None)
+
+        return body
+
+    async def _request(self, url):
+        parts = parse.urlsplit(url)
+        secure = parts.scheme == 'https'
+        port = parts.port or (443 if secure else 80)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        reader, writer = await asyncio.open_connection(
+            parts.hostname, port, ssl=self.context if secure else None)
+
+        try:
+            writer.write(('GET {0} HTTP/1.1\r\n'
+                          'Host: {1}\r\n'
+                          'User-Agent: Python-youtube\r\n'
+                          'Accept: */*\r\n'
+                          'Accept-Encoding: gzip, deflate\r\n'
+                          'Connection: close\r\n\r\n').format(path, parts.netloc).encode('latin-1'))
+            await writer.drain()
+
+            # Status line, e.g. 'HTTP/1.1 200 OK'.
+            line = (await reader.readline()).decode('latin-1').rstrip('\r\n')
+            status, reason = (line.split(' ', 2)[1:] + [''])[:2]
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            # The body is decompressed block by block while it arrives.
+            decompressor = None
+            if headers.get('content-encoding', '').lower() in ENCODINGS:
+                decompressor = Decompressor()
+
+            chunks = []
+            async for block in self._blocks(reader, headers):
+                chunks.append(decompressor.decompress(block) if decompressor else block)
+            if decompressor is not None:
+                chunks.append(decompressor.flush())
+            body = b''.join(chunks)
+        finally:
+            writer.close()
+
+        return int(status), reason, headers, body
+
+    @staticmethod
+    async def _blocks(reader, headers):
+        """Yield the blocks of the body as they are received."""
+        if 'chunked' in headers.get('transfer-encoding', '').lower():
+            while True:
+                size = (await reader.readline()).split(b';', 1)[0].strip()
+                size = int(size, 16)
+                if size == 0:
+                    # Skip the trailer section.
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    return
+                yield await reader.readexactly(size)
+                await reader.readexactly(2)  # CRLF after each chunk.
+
+        elif 'content-length' in headers:
+            remaining = int(headers['content-length'])
+            while remaining > 0:
+                block = await reader.readexactly(min(BLOCK_SIZE, remaining))
+                remaining -= len(block)
+                yield block
+
+        else:
+            while True:
+                block = await reader.read(BLOCK_SIZE)
+                if not block:
+                    return
+                yield block
+
+
+async def load_async(identifiers, video=False, playlist=False, max_concurrency=100, timeout=30,
+                     cache=None, fields=None, raw=False, scheduler=None):
+    """Asynchronously load data from YouTube.
+
+    Args:
+        identifiers (list): Unique identifiers for each YouTube video/playlist.
+        video (bool): True if the video.
+        playlist (bool): True if the playlist.
+        max_concurrency (int): The maximum number of requests in flight at the same time.
+        timeout (float): The number of seconds to wait for a single response.
+        cache (youtube.cache.Cache): The response cache. Cached responses are not requested.
+        fields (list): The video fields that will be extracted, see `youtube.utils.SOURCES`.
+        raw (bool): If True, keep the responses as bytes instead of decoding them.
+        scheduler (youtube.utils.Scheduler): The scheduler whose rate limit and retries are
+            applied. Default to `youtube.utils.SCHEDULER`, its connections are not used.
+
+    Note:
+        Returns the same structure as `youtube.load`. If a request fails after all retries,
+        its data is replaced by the `youtube.utils.Failure`.
+
+    """
+    if video and playlist or not video and not playlist:
+        raise ValueError('Set video or playlist to True, depending on the type of data.')
+
+    data, index = _urls(identifiers, video, playlist, _kinds(fields))
+    client = Client(max_concurrency=max_concurrency, timeout=timeout)
+    scheduler = scheduler if scheduler is not None else utils.SCHEDULER
+
+    async def fetch(url):
+        try:
+            result = await scheduler.retry_async(url, client.get, url)
+            _store(data, index, url, result, raw)
+            if cache is not None:
+                cache.set(*index[url], result)
+        except Exception as exception:
+            _store(data, index, url, _failure(index[url][0], url, exception), raw=True)
+
+    await asyncio.gather(*(fetch(url) for url in _lookup(cache, data, index, raw)))
+    return data
@@ -0,0 +1,122 @@
+import sqlite3
+import threading
+import time
+
+from youtube import metrics
+
+TTL = dict(html=3600, info=3600, playlist=600, thumbnails=86400)
+
+
+class Cache(object):
+    """A response cache stored in a local SQLite database.
+
+    Args:
+        path (str): The path to the database file. Several processes can share the same file.
+        ttl (dict): The number of seconds a response is kept, by the type of data ('html',
+            'info', 'playlist', 'thumbnails'). Missing types use the defaults from `TTL`.
+        max_size (int): The maximum total size of the stored responses in bytes. The least
+            recently used responses are evicted first.
+
+    Attributes:
+        hits (int): The number of responses found in the cache by this process.
+        misses (int): The number of responses missing in the cache or expired.
+
+    Example:
+        cache = Cache('youtube.sqlite', ttl=dict(html=600), max_size=2 ** 30)
+        data = youtube.load(identifiers, video=True, cache=cache)
+
+    """
+
+    def __init__(self, path, ttl=None, max_size=2 ** 30):
+        self.path = str(path)
+        self.ttl = dict(TTL, **ttl) if ttl else TTL
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        with self._connection() as connection:
+            connection.executescript('''
+                CREATE TABLE IF NOT EXISTS responses (
+                    identifier TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    stored REAL NOT NULL,
+                    accessed REAL NOT NULL,
+                    PRIMARY KEY (identifier, kind)
+                );
+                CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+
+                CREATE TABLE IF NOT EXISTS total (size INTEGER NOT NULL);
+                INSERT INTO total SELECT 0 WHERE NOT EXISTS (SELECT * FROM total);
+
+                CREATE TRIGGER IF NOT EXISTS responses_insert AFTER INSERT ON responses
+                BEGIN UPDATE total SET size = size + new.size; END;
+                CREATE TRIGGER IF NOT EXISTS responses_delete AFTER DELETE ON responses
+                BEGIN UPDATE total SET size = size - old.size; END;
+            ''')
+
+    def get(self, identifier, kind):
+        """Return the stored response as bytes, or None if it is missing or expired."""
+        now = time.time()
+        with metrics.measure('cache', kind) as event, self._connection() as connection:
+            row = connection.execute(
+                'SELECT body, stored FROM responses WHERE identifier = ? AND kind = ?',
+                (identifier, kind)).fetchone()
+
+            if row is not None and now - row[1] > self.ttl.get(kind, 0):
+                connection.execute('DELETE FROM responses WHERE identifier = ? AND kind = ?',
+                                   (identifier, kind))
+                row = None
+
+            if row is not None:
+                connection.execute(
+                    'UPDATE responses SET accessed = ? WHERE identifier = ? AND kind = ?',
+                    (now, identifier, kind))
+                event.cached, event.size = True, len(row[0])
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        return None if row is None else bytes(row[0])
+
+    def set(self, identifier, kind, body):
+        """Store the response and evict the least recently used ones if the cache is full."""
+        now = time.time()
+        with self._connection() as connection:
+            connection.execute('DELETE FROM responses WHERE identifier = ? AND kind = ?',
+                               (identifier, kind))
+            connection.execute('INSERT INTO responses VALUES (?, ?, ?, ?, ?, ?)',
+                               (identifier, kind, body, len(body), now, now))
+
+            while connection.execute('SELECT size FROM total').fetchone()[0] > self.max_size:
+                connection.execute('DELETE FROM responses WHERE rowid IN '
+                                   '(SELECT rowid FROM responses ORDER BY accessed LIMIT 1)')
+
+    def clear(self):
+        """Remove all stored responses."""
+        with self._connection() as connection:
+            connection.execute('DELETE FROM responses')
+
+    def stats(self):
+        """Return the hit/miss counters, the number of stored responses and their total size."""
+        with self._connection() as connection:
+            entries = connection.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+            size = connection.execute('SELECT size FROM total').fetchone()[0]
+
+        return dict(hits=self.hits, misses=self.misses, entries=entries, size=size)
+
+    def _connection(self):
+        # SQLite connections cannot be shared between threads.
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection = connection
+        return connection
@@ -0,0 +1,151 @@
+import html
+from array import array
+from collections.abc import Sequence
+from xml.etree import ElementTree
+
+from youtube import metrics, utils
+
+BLOCK_SIZE = 2 ** 16
+
+
+class Cues(Sequence):
+    """The cues of a caption track, stored as arrays rather than one object per cue.
+
+    Note:
+        Each item is a `(start, duration, text)` tuple, built when it is accessed. The start and
+        duration are in seconds.
+
+    """
+
+    __slots__ = ('starts', 'durations', 'texts')
+
+    def __init__(self):
+        self.starts = array('d')
+        self.durations = array('d')
+        self.texts = []
+
+    def append(self, start, duration, text):
+        self.starts.append(start)
+        self.durations.append(duration)
+        self.texts.append(text)
+
+    def text(self, separator=' '):
+        """Join the texts of all cues, e.g. to get the transcript."""
+        return separator.join(self.texts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self.starts[index], self.durations[index], self.texts[index]
+
+    def __len__(self):
+        return len(self.texts)
+
+    def __repr__(self):
+        return 'Cues({0} cues)'.format(len(self))
+
+
+class CueParser(object):
+    """Parse the timed-text XML incrementally, as its blocks arrive.
+
+    Example:
+        parser = CueParser()
+        for block in blocks:
+            parser.feed(block)
+        cues = parser.close()
+
+    """
+
+    def __init__(self):
+        self.cues = Cues()
+        self._parser = ElementTree.XMLPullParser(events=('start', 'end'))
+        self._root = None
+
+    def feed(self, data):
+        self._parser.feed(data)
+        self._read()
+
+    def close(self):
+        self._parser.close()
+        self._read()
+        return self.cues
+
+    def _read(self):
+        for event, element in self._parser.read_events():
+            if event == 'start':
+                if self._root is None:
+                    self._root = element
+                continue
+
+            if element.tag == 'text':
+                # The text is HTML-escaped inside the XML, e.g. '&amp;#39;' for an apostrophe.
+                self.cues.append(float(element.get('start', 0)), float(element.get('dur', 0)),
+                                 html.unescape(element.text or ''))
+                # Drop the parsed elements, so the tree does not grow with the track.
+                self._root.clear()
+
+
+def parse(data):
+    """Parse the timed-text XML, as bytes or as an iterable of blocks, into `Cues`."""
+    parser = CueParser()
+    for block in ([data] if isinstance(data, (bytes, str)) else data):
+        parser.feed(block)
+    return parser.close()
+
+
+def iter_captions(videos, languages=('en',), max_workers=None, scheduler=None):
+    """Fetch and parse the caption tracks of the videos and yield each one as soon as it is done.
+
+    Args:
+        videos (iterable): The videos with the 'captions' field, e.g. from `youtube.iter_videos`
+            or `youtube.export.read`.
+        languages (list): The language codes of the tracks, e.g. ('en', 'de'). None for all of
+            the tracks.
+        max_workers (int): The maximum number of tracks fetched at the same time.
+        scheduler (youtube.utils.Scheduler): The scheduler used to send requests. Default to
+            `youtube.utils.SCHEDULER`.
+
+    Yields:
+        tuple: The video ID, the language code and the `Cues`, or the `youtube.utils.Failure` if
+        the track could not be loaded.
+
+    Note:
+        The videos are consumed lazily and each track is parsed while it is received, so memory
+        use is bounded by the number of tracks in flight and the parsed cues. A track repeated
+        while it is in flight is fetched once.
+
+    """
+    scheduler = scheduler if scheduler is not None else utils.SCHEDULER
+    groups = ((url, (identifier, language), [(None, _fetch, (url, language, scheduler))])
+              for identifier, language, url in _tracks(videos, languages))
+
+    for url, (identifier, language), results in utils._iter_window(groups, max_workers):
+        (_, future), = results
+        try:
+            cues = future.result()
+        except Exception as exception:
+            cues = utils._failure(identifier, url, exception)
+        yield identifier, language, cues
+
+
+def _tracks(videos, languages):
+    for video in videos:
+        if isinstance(video, utils.Failure):  # Yielded by `youtube.iter_videos`.
+            continue
+        for track in (video.captions or {}).values():
+            if languages is None or track['languageCode'] in languages:
+                yield video.id, track['languageCode'], track['url']
+
+
+def _fetch(url, language, scheduler):
+    with metrics.measure('captions', language) as event:
+        parser = CueParser()
+        with scheduler.request(url) as response:
+            while True:
+                block = response.read(BLOCK_SIZE)
+                if not block:
+                    break
+                parser.feed(block)
+        cues = parser.close()
+        event.size = len(cues)
+        return cues
@@ -1,28 +1,91 @@
+import concurrent.futures
+import contextlib
+import functools
 import json
+import operator
+import os
 import re
+import tempfile
+import threading
 from pathlib import Path
-from urllib import request
 
-DIR = Path(__file__, '../data')
+try:
+    import fcntl
+except ImportError:  # Not available on Windows, the update is coordinated only in-process.
+    fcntl = None
+
+from youtube import metrics, utils
+
+DIR = Path(__file__).parent / 'data'
 CIPHERS = DIR / 'ciphers.json'
+LOCK = DIR / 'ciphers.json.lock'
+
+# The known ciphers by 'sts' value, loaded from CIPHERS and reloaded when the file changes.
+_ciphers = {}
+_mtime = None
+_lock = threading.Lock()
 
+# The updates in progress in this process by 'sts' value.
+_updates = {}
 
-def update(player):
+
+def update(player, scheduler=None):
     """Find and update the cipher.
 
     Args:
         player (dict): Contains the 'sts' value and URL of the YouTube player.
+        scheduler (youtube.utils.Scheduler): The scheduler used to request the player.
 
     Returns:
         str: The cipher that corresponding to the 'sts' value.
 
+    Note:
+        Only one thread per process and one process per host finds the cipher for the 'sts'
+        value at a time, the others wait for its result.
+
     """
     sts = player['sts']
-    url = player['url']
+
+    with _lock:
+        future = _updates.get(sts)
+        leader = future is None
+        if leader:
+            future = _updates[sts] = concurrent.futures.Future()
+
+    if not leader:
+        return future.result()
+
+    try:
+        with metrics.measure('cipher', 'update'), _file_lock():
+            # Another process may have found the cipher while this one was waiting.
+            cipher = registry().get(sts)
+            if cipher is None:
+                cipher = find(player['url'], scheduler)
+                _save(sts, cipher)
+        future.set_result(cipher)
+    except BaseException as exception:
+        future.set_exception(exception)
+        raise
+    finally:
+        with _lock:
+            del _updates[sts]
+
+    return cipher
+
+
+def find(url, scheduler=None):
+    """Find the cipher in the YouTube player.
+
+    Args:
+        url (str): The URL of the YouTube player.
+        scheduler (youtube.utils.Scheduler): The scheduler used to request the player. Default
+            to `youtube.utils.SCHEDULER`.
+
+    """
     cipher = []
 
-    with request.urlopen(url) as file:
-        player = file.read().decode('utf-8')
+    scheduler = scheduler if scheduler is not None else utils.SCHEDULER
+    player = scheduler.fetch(url).decode('utf-8')
 
     name = re.search(r'"signature",(\w*)\(', player).group(1)
 
@@ -76,65 +139,131 @@ def update(player):
         elif re.search(name + r':function.*(length).*', functions):
             cipher.append('w{0}'.format(value))  # w – the swap method.
 
-    cipher = ' '.join(cipher)
+    return ' '.join(cipher)
 
-    # Add the new cipher to the ../data/ciphers.json file.
-    if DIR.exists() and CIPHERS.exists():
-        try:
-            with CIPHERS.open('r+') as file:
-                ciphers = json.load(file)
-                ciphers.update({sts: cipher})
-                file.seek(0)
-                json.dump(ciphers, file, indent=2)
-                file.truncate()
-        except json.decoder.JSONDecodeError:
-            pass
-    else:
-        # Create the new directory and ../data/ciphers.json file.
+
+@contextlib.contextmanager
+def _file_lock():
+    """Hold the exclusive lock on the ../data/ciphers.json.lock file, shared between processes."""
+    try:
         DIR.mkdir(parents=True, exist_ok=True)
-        CIPHERS.touch()
-        with CIPHERS.open('w') as file:
-            json.dump({sts: cipher}, file, indent=2)
+        file = LOCK.open('a')
+    except OSError:
+        # The data directory is read-only, the update is coordinated only in-process.
+        yield
+        return
 
-    return cipher
+    with file:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+def _save(sts, cipher):
+    """Add the new cipher to the ../data/ciphers.json file.
+
+    Note:
+        The file is replaced atomically, so readers never see a partially written file.
+
+    """
+    # Make the new cipher known to this process even if the file cannot be written.
+    with _lock:
+        _ciphers[sts] = cipher
+
+    ciphers = dict(registry(), **{sts: cipher})
+
+    try:
+        with tempfile.NamedTemporaryFile('w', dir=str(DIR), suffix='.tmp', delete=False) as file:
+            json.dump(ciphers, file, indent=2)
+    except OSError:
+        return
+
+    try:
+        os.chmod(file.name, 0o644)
+        os.replace(file.name, str(CIPHERS))
+    except OSError:
+        os.remove(file.name)
 
 
-def get(player):
+def get(player, scheduler=None):
     """Get the cipher that corresponding to the YouTube player version.
 
     Args:
         player (dict): Contains the 'sts' value and URL of the YouTube player.
+        scheduler (youtube.utils.Scheduler): The scheduler used to request the player if the
+            cipher is missing.
 
     Note:
        If the cipher is missing in known ciphers, then the 'update' method will be used.
 
     """
-    if DIR.exists() and CIPHERS.exists():
-        try:
-            if CIPHERS.stat().st_size > 0:
-                with CIPHERS.open('r') as file:
-                    ciphers = json.load(file)
-                    cipher = ciphers.get(player['sts'])
-                    return cipher
-        except json.decoder.JSONDecodeError:
-            pass
-    else:
-        cipher = update(player)
+    with metrics.measure('cipher', 'get') as event:
+        cipher = registry().get(player['sts'])
+        event.cached = cipher is not None
+        if cipher is None:
+            cipher = update(player, scheduler)
         return cipher
 
 
+def registry():
+    """Get the known ciphers by 'sts' value.
+
+    Note:
+        The ../data/ciphers.json file is parsed once and parsed again only if its modification
+        time changes.
+
+    """
+    global _ciphers, _mtime
+
+    try:
+        mtime = CIPHERS.stat().st_mtime_ns
+    except OSError:
+        mtime = None
+
+    if mtime != _mtime:
+        with _lock:
+            if mtime != _mtime:
+                try:
+                    with CIPHERS.open('r') as file:
+                        ciphers = json.load(file)
+                except (OSError, ValueError):
+                    ciphers = {}
+                _ciphers, _mtime = dict(_ciphers, **ciphers), mtime
+
+    return _ciphers
+
+
 def decipher(signature, cipher):
     """Decipher the signature."""
-    signature = list(signature)
-    cipher = cipher.split(' ')
+    return ''.join(_gather(cipher, len(signature))(signature))
+
+
+@functools.lru_cache(maxsize=256)
+def _gather(cipher, length):
+    # Takes all characters of the signature in the deciphered order in a single call.
+    return operator.itemgetter(*permutation(cipher, length))
 
-    for operation in cipher:
+
+def permutation(cipher, length):
+    """Compile the cipher into the order of characters for signatures of the given length.
+
+    Example:
+        permutation('s3 r7 w49', 86) == (85, 84, ..., 3) with the characters [0] and [49] swapped.
+
+    """
+    index = list(range(length))
+
+    for operation in cipher.split(' '):
         n = int(operation[1:])
-        if operation[0] is 's':
-            signature = signature[n:]
-        elif operation[0] is 'r':
-            signature = signature[::-1]
-        elif operation[0] is 'w':
-            signature[0], signature[n] = signature[n], signature[0]
-
-    return ''.join(signature)
+        if operation[0] == 's':
+            index = index[n:]
+        elif operation[0] == 'r':
+            index.reverse()
+        elif operation[0] == 'w':
+            index[0], index[n] = index[n], index[0]
+
+    return tuple(index)
@@ -0,0 +1,253 @@
+"""Load the videos from a list of identifiers and export them, resuming where a previous run
+stopped.
+
+Example:
+
+    $ youtube-crawl ids.txt -o videos.jsonl --fields title,statistics --workers 50
+    $ cat ids.txt | youtube-crawl -o videos.0.jsonl --shard 0/4
+
+The IDs of the written videos are appended to the checkpoint log every `--batch` videos, with
+the size of the output at that point. A restarted run truncates the output to the last recorded
+size, which drops a partly written record, skips the recorded IDs and appends to the output. The
+videos written after the last checkpoint of an interrupted run are written again. The IDs that
+failed are printed to stderr and tried again by the next run.
+
+The recorded IDs are kept in memory to skip them, split very large inputs with `--shard`. Each
+shard needs its own output and checkpoint log, a run refuses the ones locked by another run. A
+repeated ID of the input is loaded again, unless it was recorded by a previous run.
+
+"""
+import argparse
+import os
+import stat
+import sys
+import time
+import zlib
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows, the files are not locked.
+    fcntl = None
+
+from youtube import export
+from youtube.cache import Cache
+from youtube.utils import Failure, Scheduler, get_video_id
+from youtube.video import FIELDS, iter_videos
+
+
+def main(argv=None):
+    args = _parser().parse_args(argv)
+
+    fields = tuple(args.fields.split(',')) if args.fields else None
+    shard, shards = args.shard
+    checkpoint = args.checkpoint
+    if checkpoint is None and args.output != '-':
+        checkpoint = args.output + '.done'
+
+    scheduler = Scheduler(rate=args.rate, retries=args.retries)
+    cache = Cache(args.cache) if args.cache else None
+
+    source = sys.stdin if args.input == '-' else open(args.input, 'r')
+    output = sys.stdout.buffer if args.output == '-' else open(args.output, 'ab')
+    log = open(checkpoint, 'a') if checkpoint else None
+    try:
+        # The output and the log are truncated below, they can't be shared by several runs.
+        for file in (output, log):
+            if file not in (None, sys.stdout.buffer):
+                _lock(file)
+
+        done, size = _done(checkpoint) if checkpoint else (set(), None)
+        if size is not None and output is not sys.stdout.buffer:
+            if os.fstat(output.fileno()).st_size < size:
+                raise ValueError('{0} is shorter than recorded in {1}'.format(
+                    args.output, checkpoint))
+            # Drop the records written after the last checkpoint, the last one may be partial.
+            output.truncate(size)
+            output.seek(0, os.SEEK_END)
+
+        writer = (export.BinaryWriter if args.format == 'binary' else export.JSONLinesWriter)(
+            output, fields=fields)
+    except (OSError, ValueError) as exception:
+        for file in (source, output, log):
+            if file not in (None, sys.stdin, sys.stdout.buffer):
+                file.close()
+        print('youtube-crawl: {0!s}'.format(exception), file=sys.stderr)
+        return 2
+
+    if log is not None and size is None:
+        # The size of the output before the first record of this checkpoint.
+        _record(log, output, [])
+
+    invalid = []
+    identifiers = (identifier for identifier in _identifiers(source, invalid)
+                   if identifier not in done and _shard(identifier, shards) == shard)
+
+    start = time.monotonic()
+    written, failed, batch = 0, 0, []
+    try:
+        for video in iter_videos(identifiers, max_workers=args.workers, cache=cache,
+                                 fields=fields, scheduler=scheduler):
+            if not isinstance(video, Failure):
+                try:
+                    writer.write(video)
+                except Exception as exception:
+                    # A field could not be extracted, nothing of the video was written.
+                    video = Failure(video.id, video.url, None, exception, 1)
+
+            if isinstance(video, Failure):
+                # Not recorded, so the next run tries it again.
+                failed += 1
+                print('{0}\t{1}\t{2!s}'.format(video.identifier, video.status, video.error),
+                      file=sys.stderr)
+                continue
+
+            batch.append(video.id)
+            written += 1
+
+            if len(batch) >= args.batch:
+                _commit(writer, output, log, batch)
+    finally:
+        _commit(writer, output, log, batch)
+        for file in (source, output, log):
+            if file not in (None, sys.stdin, sys.stdout.buffer):
+                file.close()
+
+    failed += len(invalid)
+    print('{0} written, {1} failed, {2} done before in {3:.1f}s'.format(
+        written, failed, len(done), time.monotonic() - start), file=sys.stderr)
+    return 1 if failed else 0
+
+
+def _parser():
+    parser = argparse.ArgumentParser(
+        prog='youtube-crawl', description='Load YouTube videos and write them as they arrive.')
+    parser.add_argument('input', nargs='?', default='-',
+                        help='the file with one video ID or URL per line, default to stdin')
+    parser.add_argument('-o', '--output', default='-', help='the output file, default to stdout')
+    parser.add_argument('--format', choices=('jsonl', 'binary'), default='jsonl',
+                        help='see youtube.export, default to jsonl')
+    parser.add_argument('--fields', type=_fields,
+                        help='comma-separated fields to load and write, default to all')
+    parser.add_argument('--workers', type=int, default=20,
+                        help='the number of requests in flight, default to 20')
+    parser.add_argument('--batch', type=int, default=1000,
+                        help='the number of videos written between checkpoints')
+    parser.add_argument('--checkpoint',
+                        help='the log of the finished IDs, default to OUTPUT.done')
+    parser.add_argument('--shard', type=_shards, default=(0, 1), metavar='i/N',
+                        help='load only the IDs of the shard i of N, from 0 to N-1')
+    parser.add_argument('--cache', help='the path to the response cache, see youtube.Cache')
+    parser.add_argument('--rate', type=float,
+                        help='the maximum number of requests per second')
+    parser.add_argument('--retries', type=int, default=3,
+                        help='the number of retries of failed requests, default to 3')
+    return parser
+
+
+def _fields(value):
+    unknown = set(value.split(',')).difference(FIELDS)
+    if unknown:
+        raise argparse.ArgumentTypeError('unknown fields: {0}'.format(', '.join(sorted(unknown))))
+    return value
+
+
+def _shards(value):
+    try:
+        shard, shards = (int(number) for number in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError('expected i/N, e.g. 0/4') from None
+    if not 0 <= shard < shards:
+        raise argparse.ArgumentTypeError('expected 0 <= i < N')
+    return shard, shards
+
+
+def _shard(identifier, shards):
+    # crc32 is the same in every process and on every machine, unlike hash().
+    return zlib.crc32(identifier.encode('utf-8')) % shards
+
+
+def _identifiers(lines, invalid):
+    """Yield the IDs of the lines, the lines without one are printed to stderr and added to
+    `invalid`."""
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        try:
+            yield get_video_id(line) if '/' in line else line
+        except AttributeError:
+            # Not a video URL, e.g. a channel or a shorts URL.
+            invalid.append(line)
+            print('{0}\t{1}\t{2}'.format(line, None, 'no video ID'), file=sys.stderr)
+
+
+def _lock(file):
+    """Lock the file for this run, or raise OSError if another run has it."""
+    if fcntl is None:
+        return
+    try:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        raise OSError('{0} is used by another run, give each shard its own output'.format(
+            file.name)) from None
+
+
+def _done(checkpoint):
+    """Read the finished IDs and the size of the output they were written up to.
+
+    Note:
+        Each batch of IDs is followed by a '@SIZE' line, '@' if the output is not a regular
+        file. The IDs after the last of these lines, of a batch that was being recorded, are
+        removed from the log. A log without these lines has only IDs, they are all finished.
+
+    """
+    done, batch, size, position, end = set(), [], None, 0, None
+    try:
+        with open(checkpoint, 'rb') as file:
+            for line in file:
+                if not line.endswith(b'\n'):
+                    break
+                position += len(line)
+                line = line[:-1].decode('utf-8')
+                if line.startswith('@'):
+                    done.update(batch)
+                    batch.clear()
+                    size = int(line[1:]) if line[1:] else None
+                    end = position
+                else:
+                    batch.append(line)
+    except FileNotFoundError:
+        return done, None
+
+    if end is None:
+        return set(batch), None
+
+    os.truncate(checkpoint, end)
+    return done, size
+
+
+def _commit(writer, output, log, batch):
+    """Write out the buffered videos, then record their IDs as finished."""
+    writer.flush()
+    if log is None or not batch:
+        batch.clear()
+        return
+
+    # The IDs are recorded only once the videos are on disk.
+    _record(log, output, batch)
+    batch.clear()
+
+
+def _record(log, output, batch):
+    """Record the IDs with the size of the output, once it is on disk."""
+    regular = stat.S_ISREG(os.fstat(output.fileno()).st_mode)
+    if regular:
+        os.fsync(output.fileno())
+    size = str(os.fstat(output.fileno()).st_size) if regular else ''
+
+    log.write(''.join(identifier + '\n' for identifier in batch) + '@' + size + '\n')
+    log.flush()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
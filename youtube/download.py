@@ -0,0 +1,181 @@
+import concurrent.futures
+import json
+import os
+import threading
+from urllib import parse
+
+from youtube import metrics, utils
+
+CHUNK_SIZE = 2 ** 23  # The size of each byte range, 8 MiB.
+BUFFER_SIZE = 2 ** 16
+
+# The query parameters of the stream URL that stay the same when the video is resolved again,
+# unlike e.g. 'expire' and 'signature'.
+STABLE = ('id', 'itag', 'clen', 'lmt')
+
+
+def download(stream, path, workers=4, chunk_size=CHUNK_SIZE, progress=None, scheduler=None):
+    """Download the stream into the file, requesting byte ranges concurrently.
+
+    Args:
+        stream (youtube.streams.Stream): The stream, e.g. `video.best_adaptive(video=True)`. The
+            URL of the stream as `str` is accepted too.
+        path (str): The path to the file.
+        workers (int): The number of ranges downloaded at the same time.
+        chunk_size (int): The size of each range in bytes.
+        progress (callable): Called with the number of downloaded bytes and the size of the
+            stream each time a part of the stream is written.
+        scheduler (youtube.utils.Scheduler): The scheduler whose connections, rate limit and
+            retries are used. Default to `youtube.utils.SCHEDULER`.
+
+    Returns:
+        str: The path to the file.
+
+    Raises:
+        youtube.utils.FetchError: If a range could not be downloaded after all retries. The
+            downloaded ranges are kept and the next call with the same path resumes.
+
+    Note:
+        The stream is written into the preallocated `path + '.part'` file and the completed
+        ranges are recorded in `path + '.part.json'`, with the stream, size and chunk size they
+        belong to. The stream is identified by the `STABLE` parameters of its URL, so a download
+        resumes with the URL of the video resolved again. The file is renamed to `path` once all of the ranges are written.
+
+    """
+    scheduler = scheduler if scheduler is not None else utils.SCHEDULER
+    url = stream if isinstance(stream, str) else stream.url
+    size = None if isinstance(stream, str) else stream.size
+    if size is None:
+        size = _size(url, scheduler)
+
+    part, state = path + '.part', path + '.part.json'
+    chunks = [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+
+    fd = os.open(part, os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        # The completed ranges are only in a part file of the full size, a new or truncated
+        # one is downloaded again.
+        if os.fstat(fd).st_size == size:
+            done = _resume(state, _key(url), size, chunk_size)
+        else:
+            done = set()
+            os.ftruncate(fd, size)
+
+        writer = _Writer(fd, size, sum(end - start for start, end in chunks if start in done),
+                         progress)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(_fetch, url, start, end, writer, scheduler): start
+                       for start, end in chunks if start not in done}
+
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    future.result()
+                    # The range is recorded only once it is on disk.
+                    os.fsync(fd)
+                    done.add(futures[future])
+                    _save(state, _key(url), size, chunk_size, done)
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+    finally:
+        os.close(fd)
+
+    os.replace(part, path)
+    if os.path.exists(state):
+        os.remove(state)
+    return path
+
+
+class _Writer(object):
+    """Write the ranges into the file at their offsets and report the progress."""
+
+    def __init__(self, fd, size, downloaded, progress):
+        self.fd = fd
+        self.size = size
+        self.downloaded = downloaded
+        self.progress = progress
+        self._lock = threading.Lock()
+
+    def write(self, offset, data):
+        view = memoryview(data)
+        while view:
+            written = _pwrite(self.fd, view, offset)
+            view, offset = view[written:], offset + written
+
+        if self.progress is not None:
+            with self._lock:
+                self.downloaded += len(data)
+                downloaded = self.downloaded
+            self.progress(downloaded, self.size)
+
+
+def _fetch(url, start, end, writer, scheduler):
+    """Download the range [start, end) and write it, each retry resumes where it stopped."""
+    offset = start
+
+    def fetch():
+        nonlocal offset
+        # The offsets are of the stream itself, not of a compressed body.
+        headers = {'Range': 'bytes={0}-{1}'.format(offset, end - 1),
+                   'Accept-Encoding': 'identity'}
+        with scheduler.connections.request(url, headers=headers) as response:
+            if response.status != 206 and (offset, end) != (0, writer.size):
+                raise ValueError('The server does not support byte ranges.')
+            while offset < end:
+                data = response.read(min(BUFFER_SIZE, end - offset))
+                if not data:
+                    raise ConnectionError('The response ended before the range.')
+                writer.write(offset, data)
+                offset += len(data)
+
+    with metrics.measure('download', 'range') as event:
+        scheduler.retry(url, fetch)
+        event.size = end - start
+
+
+def _size(url, scheduler):
+    """Request the size of the stream, when `clen` is missing."""
+    headers = {'Accept-Encoding': 'identity'}
+    with scheduler.request(url, method='HEAD', headers=headers) as response:
+        response.read()
+        return int(response.headers['Content-Length'])
+
+
+def _key(url):
+    """Identify the stream by the parameters of its URL that do not expire."""
+    query = dict(parse.parse_qsl(parse.urlsplit(url).query))
+    key = {name: query[name] for name in STABLE if name in query}
+    return key if key else url
+
+
+def _resume(state, key, size, chunk_size):
+    """Read the offsets of the completed ranges of the previous download, if it was the same."""
+    try:
+        with open(state, 'r') as file:
+            previous = json.load(file)
+    except (OSError, ValueError):
+        return set()
+
+    if (previous.get('stream'), previous.get('size'), previous.get('chunk_size')) != (
+            key, size, chunk_size):
+        return set()
+    return set(previous['done'])
+
+
+def _save(state, key, size, chunk_size, done):
+    with open(state + '.tmp', 'w') as file:
+        json.dump(dict(stream=key, size=size, chunk_size=chunk_size, done=sorted(done)), file)
+    os.replace(state + '.tmp', state)
+
+
+if hasattr(os, 'pwrite'):
+    _pwrite = os.pwrite
+else:  # Not available on Windows, the writes are serialized.
+    _pwrite_lock = threading.Lock()
+
+    def _pwrite(fd, data, offset):
+        with _pwrite_lock:
+            os.lseek(fd, offset, os.SEEK_SET)
+            return os.write(fd, data)
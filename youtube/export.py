@@ -0,0 +1,298 @@
+import json
+import struct
+from collections.abc import Mapping
+
+from youtube.streams import KEYS, Stream, Streams
+from youtube.utils import Failure
+from youtube.video import FIELDS, THUMBNAIL, THUMBNAILS
+
+# The fields written by default. The thumbnails depend only on the video ID, the reader of the
+# binary format derives them.
+EXPORT_FIELDS = tuple(name for name in FIELDS if name != 'thumbnails')
+
+BUFFER_SIZE = 2 ** 20
+
+MAGIC = b'YTV\x01'
+LENGTH = struct.Struct('<I')
+
+# The attributes of `Stream` in the order they are stored in the binary format.
+STREAM = Stream.__slots__
+
+
+class _Writer(object):
+
+    def __init__(self, file, fields=None, buffer_size=BUFFER_SIZE):
+        self.fields = tuple(fields) if fields is not None else EXPORT_FIELDS
+        self.count = 0
+
+        unknown = set(self.fields).difference(FIELDS)
+        if unknown:
+            raise ValueError('Unknown fields: {0}'.format(', '.join(sorted(unknown))))
+
+        self._owned = isinstance(file, str)
+        self._file = open(file, 'wb', buffering=0) if self._owned else file
+        self._buffer = []
+        self._buffered = 0
+        self._buffer_size = buffer_size
+
+    def write(self, video):
+        """Serialize the video and write it once the buffer is full."""
+        record = self._encode(video)
+        self._buffer.append(record)
+        self._buffered += len(record)
+        self.count += 1
+
+        if self._buffered >= self._buffer_size:
+            self.flush()
+
+    def writemany(self, videos):
+        """Write the videos, e.g. from `youtube.iter_videos`, and return the number written.
+
+        Note:
+            The `youtube.utils.Failure` values yielded in place of videos are skipped.
+
+        """
+        count = self.count
+        for video in videos:
+            if not isinstance(video, Failure):
+                self.write(video)
+        return self.count - count
+
+    def flush(self):
+        if self._buffer:
+            self._file.write(b''.join(self._buffer))
+            self._buffer.clear()
+            self._buffered = 0
+        self._file.flush()
+
+    def close(self):
+        self.flush()
+        if self._owned:
+            self._file.close()
+
+    def _values(self, video):
+        # Fields that were not loaded for this video are written as null.
+        loaded = video.fields
+        return [getattr(video, name) if loaded is None or name in loaded else None
+                for name in self.fields]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class JSONLinesWriter(_Writer):
+    """Write videos as JSON Lines, one object per video.
+
+    Args:
+        file: The path or the binary file object to write to.
+        fields (list): The fields to write, see `youtube.video.FIELDS`. Default to
+            `EXPORT_FIELDS`.
+        buffer_size (int): The number of bytes collected before they are written to the file.
+
+    Note:
+        Each line has the selected fields and the 'id' and 'url' of the video, with the same
+        values as `video.__dict__`, except 'streams' that is the list of the streams from the
+        best to the worst, each with its 'itag' and 'kind'.
+
+    Example:
+        with JSONLinesWriter('videos.jsonl', fields=('title', 'statistics')) as writer:
+            writer.writemany(iter_videos(identifiers))
+
+    """
+
+    def __init__(self, file, fields=None, buffer_size=BUFFER_SIZE):
+        super().__init__(file, fields, buffer_size)
+        # One encoder for all records, `json.dumps` with arguments creates a new one each call.
+        self._encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'),
+                                         default=_json)
+
+    def _encode(self, video):
+        record = dict(zip(self.fields, self._values(video)), id=video.id, url=video.url)
+        return (self._encoder.encode(record) + '\n').encode('utf-8')
+
+
+class BinaryWriter(_Writer):
+    """Write videos as compact binary records, read them back with `read`.
+
+    Args:
+        file: The path or the binary file object to write to.
+        fields (list): The fields to write, see `youtube.video.FIELDS`. Default to
+            `EXPORT_FIELDS`.
+        buffer_size (int): The number of bytes collected before they are written to the file.
+
+    Raises:
+        ValueError: If the records are appended to a file written with other fields.
+
+    Note:
+        The file starts with `MAGIC` and the list of fields, unless the records are appended to
+        a file opened in the 'ab' mode that already has them, with the same fields. Each record
+        is its length followed by the ID and each field as a length-prefixed JSON value, so a
+        field can be decoded without decoding the others. The streams are stored as lists of
+        the `Stream` attributes, the URL and the thumbnails are not stored.
+
+    """
+
+    def __init__(self, file, fields=None, buffer_size=BUFFER_SIZE):
+        super().__init__(file, fields, buffer_size)
+        self._encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'),
+                                         default=_compact)
+
+        # The records are appended to a file that already has the header.
+        if _position(self._file) == 0:
+            header = json.dumps(self.fields).encode('utf-8')
+            self._buffer.append(MAGIC + LENGTH.pack(len(header)) + header)
+        elif _appended(self._file) != list(self.fields):
+            raise ValueError('The file was written with other fields, the records cannot be '
+                             'appended to it.')
+
+    def _encode(self, video):
+        encode = self._encoder.encode
+        parts = []
+        for value in [video.id] + self._values(video):
+            value = encode(value).encode('utf-8')
+            parts.append(LENGTH.pack(len(value)))
+            parts.append(value)
+
+        record = b''.join(parts)
+        return LENGTH.pack(len(record)) + record
+
+
+class Record(Mapping):
+    """A video read from the binary format, each field is decoded on access.
+
+    Note:
+        The fields are available as items and attributes, e.g. `record['title']` or
+        `record.title`. 'id', 'url' and 'thumbnails' are always available.
+
+    """
+
+    __slots__ = ('_names', '_record', '_offsets')
+
+    def __init__(self, names, record):
+        self._names = names
+        self._record = record
+        self._offsets = None
+
+    def __getitem__(self, name):
+        if name == 'url':
+            return 'https://www.youtube.com/watch?v={0}'.format(self['id'])
+        if name == 'thumbnails' and name not in self._names:
+            return {key: THUMBNAIL.format(self['id'], filename) for key, filename in THUMBNAILS}
+
+        index = self._names.get(name)
+        if index is None:
+            raise KeyError(name)
+
+        if self._offsets is None:
+            self._offsets = _offsets(self._record)
+        start, end = self._offsets[index]
+        value = json.loads(self._record[start:end].decode('utf-8'))
+
+        if name == 'streams' and value is not None:
+            value = Streams(Stream(*stream) for stream in value)
+        return value
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __iter__(self):
+        yield from self._names
+        yield 'url'
+        if 'thumbnails' not in self._names:
+            yield 'thumbnails'
+
+    def __len__(self):
+        return len(self._names) + 1 + ('thumbnails' not in self._names)
+
+    def __repr__(self):
+        return 'Record(id={0!r})'.format(self['id'])
+
+
+def read(file):
+    """Read the videos written by `BinaryWriter`.
+
+    Args:
+        file: The path or the binary file object to read from.
+
+    Yields:
+        Record: Each video, its fields are decoded only when they are accessed.
+
+    """
+    if isinstance(file, str):
+        with open(file, 'rb', buffering=BUFFER_SIZE) as file:
+            yield from read(file)
+        return
+
+    names = {name: index for index, name in enumerate(['id'] + _header(file))}
+
+    while True:
+        length = file.read(LENGTH.size)
+        if not length:
+            return
+        yield Record(names, file.read(LENGTH.unpack(length)[0]))
+
+
+def _header(file):
+    """Read the list of fields at the start of the file."""
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError('Not a file written by BinaryWriter.')
+
+    length = file.read(LENGTH.size)
+    if len(length) != LENGTH.size:
+        raise ValueError('The header of the file is incomplete.')
+    return json.loads(file.read(LENGTH.unpack(length)[0]).decode('utf-8'))
+
+
+def _appended(file):
+    """Read the fields of the file the records are appended to, it is opened for writing."""
+    name = getattr(file, 'name', None)
+    if not isinstance(name, str):
+        raise ValueError('The fields of the file the records are appended to cannot be read.')
+
+    with open(name, 'rb') as header:
+        return _header(header)
+
+
+def _position(file):
+    try:
+        return file.tell()
+    except (AttributeError, OSError):  # Not seekable, e.g. a pipe.
+        return 0
+
+
+def _offsets(record):
+    """Find where each value of the record starts and ends."""
+    offsets = []
+    position = 0
+    while position < len(record):
+        length, = LENGTH.unpack_from(record, position)
+        position += LENGTH.size
+        offsets.append((position, position + length))
+        position += length
+    return offsets
+
+
+def _json(value):
+    if isinstance(value, Streams):
+        return value.select()
+    if isinstance(value, Stream):
+        # The same keys as the dict view of the stream, without its per-key lookups.
+        stream = dict(itag=value.itag, kind=value.kind)
+        for key in KEYS[value.kind]:
+            stream[key] = getattr(value, key)
+        return stream
+    raise TypeError('{0!r} is not JSON serializable'.format(value))
+
+
+def _compact(value):
+    if isinstance(value, Streams):
+        return value.select()
+    if isinstance(value, Stream):
+        return [getattr(value, name) for name in STREAM]
+    raise TypeError('{0!r} is not JSON serializable'.format(value))
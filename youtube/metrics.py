@@ -0,0 +1,199 @@
+import bisect
+import threading
+import time
+from urllib import error
+
+# The upper bounds of the latency histogram buckets in seconds, the last one is unbounded.
+BUCKETS = (0.0001, 0.0002, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5,
+           10, 20, 50, float('inf'))
+
+# The installed callbacks, replaced as a whole so they can be read without the lock.
+_callbacks = ()
+_lock = threading.Lock()
+
+
+class Event(object):
+    """A measured phase, passed to the callbacks.
+
+    Attributes:
+        phase (str): 'connect', 'request', 'cache', 'decode', 'extract', 'cipher', 'download'
+            or 'captions'.
+        name (str): The URL path for 'connect' and 'request', the type of data for 'cache' and
+            'decode', the field for 'extract', 'get' or 'update' for 'cipher', 'range' for
+            'download', the language code for 'captions'.
+        seconds (float): The latency.
+        size (int): The number of bytes received, read from the cache or decoded, the number
+            of cues for 'captions'.
+        status (int): The HTTP status code.
+        cached (bool): True if the data was found in the cache or in the known ciphers.
+        error (Exception): The exception raised during the phase.
+
+    """
+
+    __slots__ = ('phase', 'name', 'seconds', 'size', 'status', 'cached', 'error')
+
+    def __init__(self, phase, name):
+        self.phase = phase
+        self.name = name
+        self.seconds = None
+        self.size = None
+        self.status = None
+        self.cached = None
+        self.error = None
+
+    def __repr__(self):
+        return 'Event(phase={0!r}, name={1!r}, seconds={2!r})'.format(
+            self.phase, self.name, self.seconds)
+
+
+class _Measurement(object):
+    __slots__ = ('event', 'start')
+
+    def __init__(self, phase, name):
+        self.event = Event(phase, name)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self.event
+
+    def __exit__(self, kind, exception, traceback):
+        event = self.event
+        event.seconds = time.perf_counter() - self.start
+        if exception is not None:
+            event.error = exception
+            if isinstance(exception, error.HTTPError):
+                event.status = exception.code
+        emit(event)
+
+
+class _Disabled(object):
+    """Measures nothing, returned by `measure` while no callback is installed."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, kind, exception, traceback):
+        pass
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_DISABLED = _Disabled()
+
+
+def measure(phase, name):
+    """Measure the phase in a `with` block and pass the `Event` to the callbacks.
+
+    Example:
+        with measure('request', '/watch') as event:
+            body = urlopen(url)
+            event.size = len(body)
+
+    Note:
+        While no callback is installed, the same object that ignores everything is returned, so
+        the instrumentation costs a function call.
+
+    """
+    if not _callbacks:
+        return _DISABLED
+    return _Measurement(phase, name)
+
+
+def emit(event):
+    for callback in _callbacks:
+        callback(event)
+
+
+def add(callback):
+    """Install the callback, called with each `Event` in the thread where the phase ran."""
+    global _callbacks
+    with _lock:
+        _callbacks += (callback,)
+
+
+def remove(callback):
+    """Uninstall the callback."""
+    global _callbacks
+    with _lock:
+        _callbacks = tuple(item for item in _callbacks if item is not callback)
+
+
+class Metrics(object):
+    """Aggregate the events in memory into a latency histogram per phase and name.
+
+    Example:
+        with Metrics() as metrics:
+            videos = [Video(identifier=identifier, data=data[identifier]) for ...]
+        print(metrics.summary()['extract']['streams'])
+
+    Note:
+        The metrics are installed while the `with` block runs, or between `add(metrics)` and
+        `remove(metrics)`.
+
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}  # (phase, name) -> [count, errors, seconds, size, cached, histogram]
+
+    def __call__(self, event):
+        key = (event.phase, event.name)
+        bucket = bisect.bisect_left(BUCKETS, event.seconds)
+
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = [0, 0, 0.0, 0, 0, [0] * len(BUCKETS)]
+            stats[0] += 1
+            stats[1] += event.error is not None
+            stats[2] += event.seconds
+            stats[3] += event.size or 0
+            stats[4] += bool(event.cached)
+            stats[5][bucket] += 1
+
+    def summary(self):
+        """Return the statistics by phase and name.
+
+        Returns:
+            dict: For each phase, the dict that maps each name to the number of events, errors,
+            cache hits, the total bytes, the total and mean seconds, the 50th, 90th and 99th
+            percentiles, and the histogram as the number of events by bucket upper bound.
+
+        Note:
+            The percentiles are the upper bounds of the buckets they fall in.
+
+        """
+        with self._lock:
+            stats = {key: list(value[:5]) + [list(value[5])] for key, value in self._stats.items()}
+
+        summary = {}
+        for (phase, name), (count, errors, seconds, size, cached, histogram) in stats.items():
+            summary.setdefault(phase, {})[name] = dict(
+                count=count, errors=errors, cached=cached, bytes=size, seconds=seconds,
+                mean=seconds / count, p50=_percentile(histogram, count, 0.5),
+                p90=_percentile(histogram, count, 0.9), p99=_percentile(histogram, count, 0.99),
+                histogram={bound: number for bound, number in zip(BUCKETS, histogram) if number})
+        return summary
+
+    def clear(self):
+        with self._lock:
+            self._stats.clear()
+
+    def __enter__(self):
+        add(self)
+        return self
+
+    def __exit__(self, *args):
+        remove(self)
+
+
+def _percentile(histogram, count, fraction):
+    rank = fraction * count
+    total = 0
+    for bound, number in zip(BUCKETS, histogram):
+        total += number
+        if total >= rank:
+            return bound
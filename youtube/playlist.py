@@ -1 +1,115 @@
-pass
+import concurrent.futures
+
+from youtube import utils
+from youtube.utils import load, get_playlist_id
+from youtube.video import iter_videos
+
+
+class Playlist(object):
+    """Base class for YouTube playlist.
+
+    Args:
+        url (str): The YouTube playlist URL.
+        identifier (str): The YouTube playlist ID.
+        data (dict): The pre-loaded data, the first page returned by `load(..., playlist=True)`.
+        cache (youtube.cache.Cache): The response cache used to load the pages and the videos.
+        scheduler (youtube.utils.Scheduler): The scheduler used to send requests. Default to
+            `youtube.utils.SCHEDULER`.
+
+    Note:
+        If the data has not been loaded previously, specify the `url` or `identifier`.
+        Otherwise, specify the `identifier` and `data`.
+
+        Only the first page is loaded when the playlist is created, the next pages are loaded
+        by `entries` and `videos` as they are iterated.
+
+    """
+
+    def __init__(self, url=None, *, identifier=None, data=None, cache=None, scheduler=None):
+        if url is not None:
+            identifier = get_playlist_id(url)
+
+        if data is None:
+            data = load([identifier], playlist=True, cache=cache,
+                        scheduler=scheduler)[identifier]
+
+        if isinstance(data, utils.Failure):
+            raise utils.FetchError(data)
+
+        self.id = identifier
+        self.title = data.get('title')
+        self.author = data.get('author')
+        self.description = data.get('description')
+        self.views = data.get('views')
+        self.url = 'https://www.youtube.com/playlist?list={0}'.format(self.id)
+
+        self._first = data
+        self._cache = cache
+        self._scheduler = scheduler if scheduler is not None else utils.SCHEDULER
+
+    def entries(self):
+        """Yield the entries of the playlist, loading the pages lazily.
+
+        Yields:
+            dict: The entry from the 'video' list of the page, its video ID is 'encrypted_id'.
+
+        """
+        for page in self.pages():
+            yield from page
+
+    def pages(self):
+        """Yield the pages of the playlist as lists of new entries.
+
+        Note:
+            The next page is requested as soon as the current one is yielded, so it is loaded
+            while the current page is being used.
+
+        """
+        seen = set()
+        index = 1
+        page = self._first
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            while True:
+                entries = [entry for entry in page.get('video', [])
+                           if entry['encrypted_id'] not in seen]
+                if not entries:
+                    return
+
+                seen.update(entry['encrypted_id'] for entry in entries)
+                index += len(entries)
+                future = executor.submit(self._page, index)
+
+                yield entries
+                page = future.result()
+
+    def videos(self, max_workers=None, cache=None, fields=None):
+        """Load the videos of the playlist and yield each `Video` as soon as it has arrived.
+
+        Args:
+            max_workers (int): The maximum number of threads that can be used to load videos.
+            cache (youtube.cache.Cache): The response cache used to load the videos. Default
+                to the cache of the playlist.
+            fields (list): The fields that will be used, see `youtube.video.FIELDS`.
+
+        Note:
+            The videos are loaded while the next page is requested, so the expansion is bounded
+            by `max_workers` rather than by the number of pages.
+
+        """
+        identifiers = (entry['encrypted_id'] for entry in self.entries())
+        cache = cache if cache is not None else self._cache
+        yield from iter_videos(identifiers, max_workers=max_workers, cache=cache, fields=fields,
+                               scheduler=self._scheduler)
+
+    def _page(self, index):
+        # The pages are cached under the playlist ID and the index of their first entry.
+        key = '{0}:{1}'.format(self.id, index)
+        body = self._cache.get(key, 'playlist') if self._cache is not None else None
+        if body is None:
+            url = '{0}/list_ajax?style=json&action_get_list=1&list={1}&index={2}'.format(
+                utils.HOST, self.id, index)
+            body = self._scheduler.fetch(url)
+            if self._cache is not None:
+                self._cache.set(key, 'playlist', body)
+        return utils._decode('playlist', body)
@@ -0,0 +1,276 @@
+import http.client
+import ssl
+import threading
+import time
+import zlib
+from urllib import error, parse
+
+from youtube import metrics
+
+BLOCK_SIZE = 2 ** 16
+
+# The values of Content-Encoding that are decompressed.
+ENCODINGS = ('gzip', 'x-gzip', 'deflate')
+
+
+class ConnectionPool(object):
+    """A thread-safe pool of persistent HTTP connections, grouped by host.
+
+    Args:
+        maxsize (int): The maximum number of idle connections kept for each host.
+        idle_timeout (float): The number of seconds an idle connection is kept open.
+        timeout (float): The socket timeout in seconds.
+
+    Note:
+        A connection is taken from the pool for a single request and returned once the response
+        has been read to the end. Connections closed by the server while idle are replaced
+        transparently.
+
+        Compressed responses are requested and decompressed while they are read.
+
+    """
+
+    def __init__(self, maxsize=10, idle_timeout=60, timeout=30):
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.context = ssl.create_default_context()
+        self.headers = {'User-Agent': 'Python-youtube', 'Accept': '*/*',
+                        'Accept-Encoding': 'gzip, deflate'}
+
+        self._lock = threading.Lock()
+        self._idle = {}  # (scheme, host, port) -> [(connection, last used), ...]
+
+    def request(self, url, method='GET', headers=None, redirects=5):
+        """Send a request and return the `Response`.
+
+        Args:
+            url (str): The absolute URL.
+            method (str): The HTTP method. Default to 'GET'.
+            headers (dict): Extra request headers.
+            redirects (int): The maximum number of redirects to follow.
+
+        Raises:
+            urllib.error.HTTPError: If the server returned a 4xx/5xx status.
+
+        """
+        parts = parse.urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        headers = dict(self.headers, **headers) if headers else self.headers
+
+        connection, reused = self._acquire(key)
+        if not reused:
+            self._connect(connection, parts.path)
+        try:
+            connection.request(method, path, headers=headers)
+            response = connection.getresponse()
+        except (ConnectionError, http.client.BadStatusLine):
+            connection.close()
+            if not reused:
+                raise
+            # The server closed the idle connection, try once more with a fresh one.
+            connection, reused = self._create(key), False
+            self._connect(connection, parts.path)
+            connection.request(method, path, headers=headers)
+            response = connection.getresponse()
+        except Exception:
+            connection.close()
+            raise
+
+        response = Response(self, key, connection, response, url)
+
+        if response.status in (301, 302, 303, 307, 308) and redirects > 0:
+            location = response.headers.get('Location')
+            if location is not None:
+                response.read()
+                response.close()
+                return self.request(parse.urljoin(url, location), method, headers, redirects - 1)
+
+        if response.status >= 400:
+            response.read()
+            response.close()
+            raise error.HTTPError(url, response.status, response.reason, response.headers, None)
+
+        return response
+
+    def urlopen(self, url, headers=None):
+        """Send a GET request and return the body of the response as bytes."""
+        with metrics.measure('request', parse.urlsplit(url).path) as event:
+            with self.request(url, headers=headers) as response:
+                event.status = response.status
+                body = response.read()
+                event.size = len(body)
+                return body
+
+    def clear(self):
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+
+        for bucket in idle.values():
+            for connection, _ in bucket:
+                connection.close()
+
+    def _acquire(self, key):
+        now = time.monotonic()
+        expired = []
+
+        with self._lock:
+            bucket = self._idle.get(key, [])
+            # The oldest connections are at the start of the bucket.
+            while bucket and now - bucket[0][1] > self.idle_timeout:
+                expired.append(bucket.pop(0)[0])
+            connection = bucket.pop()[0] if bucket else None
+
+        for stale in expired:
+            stale.close()
+
+        if connection is not None:
+            return connection, True
+
+        return self._create(key), False
+
+    @staticmethod
+    def _connect(connection, path):
+        # Connect explicitly, so DNS resolution and the handshake are measured apart.
+        with metrics.measure('connect', path or '/'):
+            connection.connect()
+
+    def _create(self, key):
+        scheme, host, port = key
+        if scheme == 'https':
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout,
+                                               context=self.context)
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    def _release(self, key, connection):
+        with self._lock:
+            bucket = self._idle.setdefault(key, [])
+            if len(bucket) < self.maxsize:
+                bucket.append((connection, time.monotonic()))
+                return
+
+        connection.close()
+
+
+class Response(object):
+    """A response whose connection goes back to the pool once the body has been read.
+
+    Attributes:
+        url (str): The requested URL.
+        status (int): The HTTP status code.
+        reason (str): The reason phrase.
+        headers (http.client.HTTPMessage): The response headers.
+
+    Note:
+        A gzip or deflate body is decompressed by `read`, `amt` is then the number of
+        compressed bytes to read, so fewer or more bytes may be returned. b'' is returned only
+        at the end of the body.
+
+    """
+
+    def __init__(self, pool, key, connection, response, url):
+        self.url = url
+        self.status = response.status
+        self.reason = response.reason
+        self.headers = response.msg
+
+        self._pool = pool
+        self._key = key
+        self._connection = connection
+        self._response = response
+
+        encoding = (response.getheader('Content-Encoding') or '').strip().lower()
+        self._decompressor = Decompressor() if encoding in ENCODINGS else None
+
+    def read(self, amt=None):
+        if self._decompressor is None:
+            data = self._response.read(amt)
+        elif amt is None:
+            # Decompress each block as it arrives instead of the whole body at the end.
+            chunks = []
+            while not self._response.isclosed():
+                chunks.append(self._decompress(self._response.read(BLOCK_SIZE)))
+            data = b''.join(chunks)
+        else:
+            # A compressed block can decompress to nothing, b'' is returned only at the end.
+            data = b''
+            while not data and not self._response.isclosed():
+                data = self._decompress(self._response.read(amt))
+
+        if self._response.isclosed():
+            self._done()
+        return data
+
+    def _decompress(self, data):
+        data = self._decompressor.decompress(data)
+        if self._response.isclosed():
+            data += self._decompressor.flush()
+        return data
+
+    def close(self):
+        if self._connection is not None:
+            # The body has not been read to the end, the connection cannot be reused.
+            self._response.close()
+            self._connection.close()
+            self._connection = None
+
+    def _done(self):
+        if self._connection is not None:
+            if self._response.will_close:
+                self._connection.close()
+            else:
+                self._pool._release(self._key, self._connection)
+            self._connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class Decompressor(object):
+    """Decompress a gzip or deflate body block by block.
+
+    Note:
+        A 'deflate' body should be a zlib stream, but some servers send a raw deflate stream
+        without the zlib header. It is decompressed as such when the header check fails.
+
+    """
+
+    def __init__(self):
+        # wbits=MAX_WBITS | 32 accepts both the gzip and zlib headers.
+        self._decompressor = zlib.decompressobj(zlib.MAX_WBITS | 32)
+        self._head = b''  # The first bytes, until the header has been checked.
+
+    def decompress(self, data):
+        if self._head is None:
+            return self._decompressor.decompress(data)
+
+        self._head += data
+        try:
+            data = self._decompressor.decompress(data)
+        except zlib.error:
+            self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+            data = self._decompressor.decompress(self._head)
+
+        # The header is checked once its first two bytes are in.
+        if len(self._head) >= 2:
+            self._head = None
+        return data
+
+    def flush(self):
+        return self._decompressor.flush()
+
+
+POOL = ConnectionPool()
+
+
+def urlopen(url, headers=None):
+    """Fetch the URL through the shared connection pool and return the body as bytes."""
+    return POOL.urlopen(url, headers=headers)
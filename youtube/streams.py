@@ -0,0 +1,148 @@
+import sys
+from collections.abc import Mapping
+
+# The keys of the dict view of each kind of stream, in the order of the former dicts.
+KEYS = {
+    'audio': ('bitrate', 'type', 'codecs', 'size', 'url'),
+    'video': ('quality', 'bitrate', 'fps', 'type', 'codecs', 'size', 'url'),
+    'multiplexed': ('quality', 'type', 'codecs', 'url'),
+}
+
+# The multiplexed streams do not have a bitrate, they are sorted by quality.
+MULTIPLEXED = ('22', '18', '43', '36', '17')
+
+
+class Stream(Mapping):
+    """A YouTube audio/video stream.
+
+    Args:
+        itag (int): The YouTube format code.
+        kind (str): 'audio' or 'video' for adaptive streams, 'multiplexed' otherwise.
+        container (str): The container format, e.g. 'mp4' or 'webm'.
+        codecs (str): The codecs, e.g. 'avc1.640028'.
+        url (str): The URL of the stream.
+        quality (str): The quality label, e.g. '1080p' or 'hd720'.
+        bitrate (int): The bitrate in bits per second.
+        fps (int): The number of frames per second.
+        size (int): The size of the stream in bytes.
+
+    Note:
+        The stream can also be used as the read-only dict of the format used before, e.g.
+        `stream['url']`, `dict(stream)`.
+
+    """
+
+    __slots__ = ('itag', 'kind', 'container', 'codecs', 'url', 'quality', 'bitrate', 'fps',
+                 'size')
+
+    def __init__(self, itag, kind, container, codecs, url, quality=None, bitrate=None, fps=None,
+                 size=None):
+        self.itag = itag
+        # These strings repeat in every video, interned they are stored once per process.
+        self.kind = sys.intern(kind)
+        self.container = sys.intern(container)
+        self.codecs = sys.intern(codecs)
+        self.url = url
+        self.quality = sys.intern(quality) if quality is not None else None
+        self.bitrate = bitrate
+        self.fps = fps
+        self.size = size
+
+    @property
+    def type(self):
+        return '{0}/{1}'.format('audio' if self.kind == 'audio' else 'video', self.container)
+
+    def __getitem__(self, key):
+        if key not in KEYS[self.kind]:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(KEYS[self.kind])
+
+    def __len__(self):
+        return len(KEYS[self.kind])
+
+    def __repr__(self):
+        return 'Stream(itag={0}, type={1!r}, quality={2!r}, bitrate={3})'.format(
+            self.itag, self.type, self.quality, self.bitrate)
+
+
+class Streams(Mapping):
+    """The streams of a video indexed by (kind, container).
+
+    Args:
+        streams (list): The `Stream` objects.
+
+    Note:
+        For backwards compatibility `streams['adaptive']['audio'|'video']` and
+        `streams['multiplexed']` return the streams by itag.
+
+    """
+
+    __slots__ = ('_index',)
+
+    def __init__(self, streams):
+        index = {}
+        for stream in streams:
+            index.setdefault((stream.kind, stream.container), []).append(stream)
+
+        # Sort the streams from the best to the worst once, so the best one is a lookup.
+        for key, value in index.items():
+            if key[0] == 'multiplexed':
+                value.sort(key=_multiplexed_rank)
+            else:
+                value.sort(key=lambda stream: stream.bitrate or 0, reverse=True)
+            index[key] = tuple(value)
+
+        self._index = index
+
+    def best(self, kind, container):
+        """Get the best stream of the kind ('audio', 'video', 'multiplexed') and container."""
+        streams = self._index.get((kind, container))
+        if streams:
+            return streams[0]
+
+    def select(self, kind=None, container=None):
+        """Get the streams of the kind and container, sorted from the best to the worst."""
+        return [stream for key, streams in self._index.items() for stream in streams
+                if kind in (None, key[0]) and container in (None, key[1])]
+
+    def as_dict(self):
+        """Get the streams as plain dicts, e.g. to serialize them."""
+        return {key: _as_dict(value) for key, value in self.items()}
+
+    def __getitem__(self, key):
+        if key == 'adaptive':
+            audio, video = self.select('audio'), self.select('video')
+            if audio or video:
+                return dict(audio=_by_itag(audio), video=_by_itag(video))
+            return None
+        elif key == 'multiplexed':
+            multiplexed = self.select('multiplexed')
+            return _by_itag(multiplexed) if multiplexed else None
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(('adaptive', 'multiplexed'))
+
+    def __len__(self):
+        return 2
+
+    def __repr__(self):
+        return 'Streams({0!r})'.format(self.select())
+
+
+def _by_itag(streams):
+    return {str(stream.itag): stream for stream in streams}
+
+
+def _as_dict(value):
+    if isinstance(value, Mapping):
+        return {key: _as_dict(item) for key, item in value.items()}
+    return value
+
+
+def _multiplexed_rank(stream):
+    itag = str(stream.itag)
+    return MULTIPLEXED.index(itag) if itag in MULTIPLEXED else len(MULTIPLEXED)
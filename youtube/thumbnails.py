@@ -0,0 +1,126 @@
+import json
+import threading
+from urllib import error
+
+from youtube import utils, video
+
+# The maximum number of video IDs whose probed thumbnails are kept in memory.
+MAX_ENTRIES = 100000
+
+# The sizes of the probed thumbnails by video ID and name, None if the thumbnail is missing. The
+# least recently used IDs are at the start of the dict.
+_known = {}
+_lock = threading.Lock()
+
+
+def iter_thumbnails(identifiers, names=None, max_workers=None, cache=None, scheduler=None):
+    """Find which thumbnails exist with HEAD requests and yield them as each video is done.
+
+    Args:
+        identifiers (iterable): The YouTube video IDs.
+        names (list): The thumbnails to probe, e.g. ('standard', 'maxres'), see
+            `youtube.video.THUMBNAILS`. Default to all of them.
+        max_workers (int): The maximum number of requests in flight.
+        cache (youtube.cache.Cache): The cache that keeps the results between processes, in
+            addition to the memory of this process.
+        scheduler (youtube.utils.Scheduler): The scheduler used to send requests. Default to
+            `youtube.utils.SCHEDULER`.
+
+    Yields:
+        tuple: The video ID and the dict of the existing thumbnails by name, each with its
+        'url' and 'size' in bytes, or the `youtube.utils.Failure` if a request failed with
+        another error than 404.
+
+    Example:
+        for identifier, thumbnails in iter_thumbnails(identifiers, names=('maxres', 'high')):
+            best = thumbnails.get('maxres') or thumbnails.get('high')
+
+    Note:
+        Only the thumbnails that are not known yet are requested. The missing thumbnails are
+        remembered as well, so they are not requested again. A video ID repeated while it is in
+        flight is probed once.
+
+    """
+    names = tuple(names) if names is not None else tuple(name for name, _ in video.THUMBNAILS)
+    unknown = set(names).difference(name for name, _ in video.THUMBNAILS)
+    if unknown:
+        raise ValueError('Unknown thumbnails: {0}.'.format(', '.join(sorted(unknown))))
+
+    scheduler = scheduler if scheduler is not None else utils.SCHEDULER
+    groups = _probes(identifiers, names, cache, scheduler)
+
+    for identifier, sizes, results in utils._iter_window(groups, max_workers):
+        failure = None
+        for (name, url), future in results:
+            try:
+                sizes[name] = future.result()
+            except Exception as exception:
+                failure = utils._failure(identifier, url, exception)
+
+        if failure is not None:
+            yield identifier, failure
+            continue
+        if results:
+            _store(identifier, sizes, cache)
+        yield identifier, _existing(identifier, sizes, names)
+
+
+def _probes(identifiers, names, cache, scheduler):
+    """Yield the probes of the thumbnails not known yet for `utils._iter_window`."""
+    for identifier in identifiers:
+        sizes = _lookup(identifier, cache)
+        urls = {name: _url(identifier, name) for name in names if name not in sizes}
+        calls = [((name, url), _probe, (url, scheduler)) for name, url in urls.items()]
+        yield identifier, dict(sizes), calls
+
+
+def _probe(url, scheduler):
+    """Return the size of the thumbnail, or None if it does not exist."""
+    try:
+        headers = {'Accept-Encoding': 'identity'}
+        with scheduler.request(url, method='HEAD', headers=headers) as response:
+            response.read()
+            return int(response.headers.get('Content-Length') or 0)
+    except utils.FetchError as exception:
+        failure = exception.failure
+        if isinstance(failure.error, error.HTTPError) and failure.status == 404:
+            return None
+        raise
+
+
+def _url(identifier, name):
+    return video.THUMBNAIL.format(identifier, dict(video.THUMBNAILS)[name])
+
+
+def _existing(identifier, sizes, names):
+    return {name: dict(url=_url(identifier, name), size=sizes[name])
+            for name in names if sizes[name] is not None}
+
+
+def _lookup(identifier, cache):
+    """Get the known sizes from the memory, then from the cache."""
+    with _lock:
+        sizes = _known.pop(identifier, None)
+        if sizes is not None:
+            # Moved to the end, so the IDs in use are evicted last.
+            _known[identifier] = sizes
+    if sizes is None and cache is not None:
+        body = cache.get(identifier, 'thumbnails')
+        if body is not None:
+            sizes = json.loads(body.decode('utf-8'))
+            _remember(identifier, sizes)
+    return sizes or {}
+
+
+def _store(identifier, sizes, cache):
+    _remember(identifier, sizes)
+    if cache is not None:
+        cache.set(identifier, 'thumbnails', json.dumps(sizes).encode('utf-8'))
+
+
+def _remember(identifier, sizes):
+    with _lock:
+        _known.pop(identifier, None)
+        _known[identifier] = sizes
+        while len(_known) > MAX_ENTRIES:
+            del _known[next(iter(_known))]
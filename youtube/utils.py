@@ -1,10 +1,200 @@
+import asyncio
+import collections
 import concurrent.futures
+import http.client
 import json
+import os
+import random
 import re
-from urllib import request, parse
+import socket
+import threading
+import time
+from urllib import error, parse
 
+from youtube import metrics, pool
 
-def load(identifiers, video=False, playlist=False, max_workers=None):
+HOST = 'https://www.youtube.com'
+
+# The types of data needed to extract each field of the video: 'info' is received from
+# https://www.youtube.com/get_video_info?..., 'html' is the page https://www.youtube.com/watch?v=...
+SOURCES = {
+    'title': ('info',),
+    'duration': ('info',),
+    'date': ('html',),
+    'description': ('html',),
+    'category': ('html',),
+    'license': ('html',),
+    'keywords': ('info',),
+    'statistics': ('info',),  # Likes and dislikes are taken from 'html' if it is loaded.
+    'channel': ('info',),  # The number of subscribers is taken from 'html' if it is loaded.
+    'player': ('html',),
+    'streams': ('info', 'html'),
+    'captions': ('info',),
+    'thumbnails': (),
+}
+
+
+class Failure(collections.namedtuple('Failure', 'identifier url status error attempts')):
+    """The request that failed, stored by the loaders in place of the data.
+
+    Attributes:
+        identifier (str): The YouTube video/playlist ID.
+        url (str): The requested URL.
+        status (int): The HTTP status code, or None if there was no response.
+        error (Exception): The last exception.
+        attempts (int): The number of attempts.
+
+    """
+
+    __slots__ = ()
+
+
+class FetchError(Exception):
+    """The request failed after all retries, see `Failure`."""
+
+    def __init__(self, failure):
+        super().__init__('{0!r} failed after {1} attempt(s): {2!s}'.format(
+            failure.url, failure.attempts, failure.error))
+        self.failure = failure
+
+
+class Scheduler(object):
+    """Send requests with the per-host rate limit and retries.
+
+    Args:
+        rate (float): The maximum number of requests per second to each host. Default to None,
+            without the limit.
+        burst (int): The number of requests to a host that can be sent at once, before the rate
+            limit applies.
+        retries (int): The maximum number of retries after 429/5xx responses, timeouts and
+            dropped connections.
+        backoff (float): The base delay between retries in seconds, doubled after each attempt.
+        max_backoff (float): The maximum delay between retries in seconds.
+        connections (youtube.pool.ConnectionPool): The connection pool used to send requests.
+
+    Note:
+        The rate limit is a token bucket per host. The delay before a retry is random between 0
+        and the exponential backoff, unless the server asks for a longer one with Retry-After.
+
+    """
+
+    def __init__(self, rate=None, burst=10, retries=3, backoff=0.5, max_backoff=30,
+                 connections=None):
+        self.rate = rate
+        self.burst = burst
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.connections = connections if connections is not None else pool.POOL
+
+        self._lock = threading.Lock()
+        self._buckets = {}  # host -> [tokens, last update]
+
+    def fetch(self, url):
+        """Send a GET request and return the body of the response as bytes.
+
+        Raises:
+            FetchError: If the request failed after all retries.
+
+        """
+        return self.retry(url, self.connections.urlopen, url)
+
+    def request(self, url, method='GET', headers=None):
+        """Send a request and return the `youtube.pool.Response`, to read the body as it arrives.
+
+        Raises:
+            FetchError: If the request failed after all retries.
+
+        Note:
+            Only sending the request and receiving the status are retried, the errors while the
+            body is read are raised by `read`.
+
+        """
+        return self.retry(url, self.connections.request, url, method, headers)
+
+    def retry(self, url, function, *args):
+        """Call the function that sends a request to the URL, with the rate limit and retries.
+
+        Returns:
+            The result of the function.
+
+        Raises:
+            FetchError: If the function failed after all retries.
+
+        Note:
+            The function is called again after the errors that can succeed on a new attempt,
+            see `_retryable`, e.g. to resume a download from where it stopped.
+
+        """
+        host = parse.urlsplit(url).netloc
+        attempt = 0
+
+        while True:
+            attempt += 1
+            delay = self._take(host)
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                return function(*args)
+            except Exception as exception:
+                time.sleep(self._retry(url, attempt, exception))
+
+    async def retry_async(self, url, function, *args):
+        """Await the coroutine function that sends a request to the URL, see `retry`.
+
+        Note:
+            The waits for the rate limit and between retries do not block the event loop.
+
+        """
+        host = parse.urlsplit(url).netloc
+        attempt = 0
+
+        while True:
+            attempt += 1
+            delay = self._take(host)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                return await function(*args)
+            except Exception as exception:
+                await asyncio.sleep(self._retry(url, attempt, exception))
+
+    def _take(self, host):
+        """Take a token from the bucket of the host and return the seconds to wait for it."""
+        if self.rate is None:
+            return 0
+
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._buckets.setdefault(host, [self.burst, now])
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate) - 1
+            bucket[1] = now
+            # The token is taken in advance, the request waits until it is refilled.
+            return -bucket[0] / self.rate if bucket[0] < 0 else 0
+
+    def _retry(self, url, attempt, exception):
+        """Return the seconds to wait before the next attempt, or raise `FetchError`."""
+        status = exception.code if isinstance(exception, error.HTTPError) else None
+        if attempt > self.retries or not _retryable(exception):
+            raise FetchError(Failure(None, url, status, exception, attempt)) from None
+        return self._delay(attempt, exception)
+
+    def _delay(self, attempt, exception):
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+
+        if isinstance(exception, error.HTTPError) and exception.headers is not None:
+            retry_after = exception.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                delay = max(delay, min(self.max_backoff, int(retry_after)))
+
+        return delay
+
+
+SCHEDULER = Scheduler()
+
+
+def load(identifiers, video=False, playlist=False, max_workers=None, cache=None, fields=None,
+         raw=False, scheduler=None):
     """Load data from YouTube.
 
     Args:
@@ -13,58 +203,277 @@ def load(identifiers, video=False, playlist=False, max_workers=None):
         playlist (bool): True if the playlist.
         max_workers (int): The maximum number of threads that can be used to execute the given
             calls.
+        cache (youtube.cache.Cache): The response cache. Cached responses are not requested.
+        fields (list): The video fields that will be extracted, see `SOURCES`. Only the types of
+            data needed for these fields are requested. Default to all fields.
+        raw (bool): If True, keep the responses as bytes instead of decoding them. The video
+            accepts both, see `youtube.Video.from_batch`.
+        scheduler (Scheduler): The scheduler used to send requests. Default to `SCHEDULER`.
 
     Note:
         If `max_workers` is None, it will default to the number of processors on the machine,
         multiplied by 5.
 
+        The worker threads share the keep-alive connections of `youtube.pool.POOL`.
+
+        If a request fails, its data is replaced by the `Failure`.
+
     """
     if video and playlist or not video and not playlist:
         raise ValueError('Set video or playlist to True, depending on the type of data.')
 
-    host = 'https://www.youtube.com'
-    data = {}
-    urls = []
-
-    if video:
-        for identifier in identifiers:
-            html = '{0}/watch?v={1}&hl=en'.format(host, identifier)
-            info = '{0}/get_video_info?video_id={1}&hl=en&eurl={0}'.format(host, identifier)
-            data.update({identifier: dict(html=html, info=info)})
-            urls.extend([info, html])
-
-    if playlist:
-        for identifier in identifiers:
-            info = '{0}/list_ajax?style=json&action_get_list=1&list={1}'.format(host, identifier)
-            data.update({identifier: info})
-            urls.append(info)
-
-    def urlopen(url):
-        with request.urlopen(url) as response:
-            return response.read()
+    data, index = _urls(identifiers, video, playlist, _kinds(fields))
+    scheduler = scheduler if scheduler is not None else SCHEDULER
 
     # See details at:
     # https://docs.python.org/3/library/concurrent.futures.html#concurrent.futures.ThreadPoolExecutor
     with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(urlopen, url): url for url in urls}
+        urls = _lookup(cache, data, index, raw)
+        futures = {executor.submit(scheduler.fetch, url): url for url in urls}
         for future in concurrent.futures.as_completed(futures):
             url = futures[future]
             try:
-                result = future.result().decode('utf-8')
-                for identifier, urls in data.items():
-                    if video:
-                        if url == urls['info']:
-                            data[identifier]['info'] = dict(parse.parse_qsl(result))
-                            break
-                        elif url == urls['html']:
-                            data[identifier]['html'] = result
-                            break
-                    if playlist:
-                        data[identifier] = json.loads(result)
+                result = future.result()
+                _store(data, index, url, result, raw)
+                if cache is not None:
+                    cache.set(*index[url], result)
             except Exception as exception:
-                print('{0!r} generated an exception: {1!s}'.format(url, exception))
+                _store(data, index, url, _failure(index[url][0], url, exception), raw=True)
     return data
 
 
+def iter_load(identifiers, video=False, playlist=False, max_workers=None, cache=None,
+              fields=None, scheduler=None, raw=False, unique=False):
+    """Load data from YouTube and yield it as soon as each identifier is complete.
+
+    Args:
+        identifiers (iterable): Unique identifiers for each YouTube video/playlist.
+        video (bool): True if the video.
+        playlist (bool): True if the playlist.
+        max_workers (int): The maximum number of threads that can be used to execute the given
+            calls.
+        cache (youtube.cache.Cache): The response cache. Cached responses are not requested.
+        fields (list): The video fields that will be extracted, see `SOURCES`. Only the types of
+            data needed for these fields are requested. Default to all fields.
+        scheduler (Scheduler): The scheduler used to send requests. Default to `SCHEDULER`.
+        raw (bool): If True, keep the responses as bytes instead of decoding them.
+        unique (bool): If True, an identifier is loaded once even if it is repeated later. The
+            loaded identifiers are then kept, so memory grows with their number.
+
+    Yields:
+        tuple: The identifier and its data, the same value as in the dict returned by `load`.
+
+    Note:
+        The identifiers are consumed lazily and at most `max_workers` of them are in flight, so
+        the number of responses held in memory does not depend on the number of identifiers.
+        An identifier repeated while it is in flight is loaded once. If a request fails, its
+        data is replaced by the `Failure`.
+
+    """
+    if video and playlist or not video and not playlist:
+        raise ValueError('Set video or playlist to True, depending on the type of data.')
+
+    scheduler = scheduler if scheduler is not None else SCHEDULER
+    groups = _requests(identifiers, video, playlist, _kinds(fields), cache, scheduler, raw, unique)
+
+    for identifier, data, results in _iter_window(groups, max_workers):
+        for (kind, url), future in results:
+            try:
+                result = future.result()
+                data[kind] = result if raw else _decode(kind, result)
+                if cache is not None:
+                    cache.set(identifier, kind, result)
+            except Exception as exception:
+                data[kind] = _failure(identifier, url, exception)
+
+        yield identifier, data if video else data['playlist']
+
+
+def _requests(identifiers, video, playlist, kinds, cache, scheduler, raw, unique):
+    """Yield the requests of each identifier for `_iter_window`, with the cached data."""
+    seen = set()
+    for identifier in identifiers:
+        if identifier in seen:
+            continue
+        if unique:
+            seen.add(identifier)
+
+        data, calls = {}, []
+        _, index = _urls([identifier], video, playlist, kinds)
+        for url, (_, kind) in index.items():
+            body = cache.get(identifier, kind) if cache is not None else None
+            if body is None:
+                calls.append(((kind, url), scheduler.fetch, (url,)))
+                continue
+            try:
+                data[kind] = body if raw else _decode(kind, body)
+            except Exception as exception:
+                data[kind] = _failure(identifier, url, exception)
+
+        yield identifier, data, calls
+
+
+def _iter_window(groups, max_workers=None):
+    """Run the calls of the groups in threads and yield each group as soon as all of its calls
+    are done.
+
+    Args:
+        groups (iterable): The `(key, state, calls)` tuples, where `calls` is a list of
+            `(tag, function, args)`. The state is passed through. A group whose key is in
+            flight is skipped.
+        max_workers (int): The maximum number of calls in flight.
+
+    Yields:
+        tuple: The key, the state and the list of `(tag, future)` of the calls, in the order
+        they completed. A group without calls is yielded at once.
+
+    Note:
+        The groups are consumed lazily, more of them are taken only when the calls in flight
+        are fewer than `max_workers`. The calls of a group are submitted together.
+
+    """
+    if max_workers is None:
+        max_workers = (os.cpu_count() or 1) * 5
+
+    groups = iter(groups)
+    futures = {}
+    pending = {}  # key -> [the number of outstanding calls, state, done calls]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            for key, state, calls in groups:
+                if key in pending:
+                    continue
+                if not calls:
+                    yield key, state, []
+                    continue
+
+                pending[key] = [len(calls), state, []]
+                for tag, function, args in calls:
+                    futures[executor.submit(function, *args)] = (key, tag)
+
+                if len(futures) >= max_workers:
+                    break
+
+            if not futures:
+                break
+
+            done, _ = concurrent.futures.wait(
+                futures, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                key, tag = futures.pop(future)
+                group = pending[key]
+                group[0] -= 1
+                group[2].append((tag, future))
+
+                if group[0] == 0:
+                    del pending[key]
+                    yield key, group[1], group[2]
+
+
+def _failure(identifier, url, exception):
+    """Describe the failed request to the URL."""
+    if isinstance(exception, FetchError):
+        return exception.failure._replace(identifier=identifier)
+    status = exception.code if isinstance(exception, error.HTTPError) else None
+    return Failure(identifier, url, status, exception, 1)
+
+
+def _retryable(exception):
+    """Check if the request that raised the exception can succeed if it is sent again."""
+    if isinstance(exception, error.HTTPError):
+        return exception.code == 429 or exception.code >= 500
+    return isinstance(exception, (socket.timeout, asyncio.TimeoutError, ConnectionError,
+                                  asyncio.IncompleteReadError, http.client.HTTPException))
+
+
+def _decode(kind, result):
+    """Decode the body of the response depending on the type of data."""
+    with metrics.measure('decode', kind) as event:
+        event.size = len(result)
+        result = result.decode('utf-8')
+        if kind == 'info':
+            return dict(parse.parse_qsl(result))
+        elif kind == 'html':
+            return result
+        return json.loads(result)
+
+
+def _kinds(fields):
+    """Return the types of data needed to extract the video fields."""
+    if fields is None:
+        return ('info', 'html')
+
+    unknown = set(fields) - set(SOURCES)
+    if unknown:
+        raise ValueError('Unknown fields: {0}.'.format(', '.join(sorted(unknown))))
+
+    return tuple(kind for kind in ('info', 'html') if any(kind in SOURCES[f] for f in fields))
+
+
+def _lookup(cache, data, index, raw=False):
+    """Store the cached responses in `data` and return the URLs that must be requested."""
+    if cache is None:
+        return list(index)
+
+    urls = []
+    for url, (identifier, kind) in index.items():
+        body = cache.get(identifier, kind)
+        if body is None:
+            urls.append(url)
+        else:
+            _store(data, index, url, body, raw)
+    return urls
+
+
+def _store(data, index, url, result, raw=False):
+    """Decode the response to the URL and store it under the identifier that owns the URL."""
+    identifier, kind = index[url]
+    if not raw:
+        result = _decode(kind, result)
+
+    if kind == 'playlist':
+        data[identifier] = result
+    else:
+        data[identifier][kind] = result
+
+
+def _urls(identifiers, video, playlist, kinds=('info', 'html')):
+    """Build the URLs to fetch for each identifier.
+
+    Returns:
+        tuple: The `data` dict that maps each identifier to its URLs and the `index` dict that
+        maps each URL to its identifier and type of data ('info', 'html' or 'playlist').
+
+    Note:
+        Repeated identifiers are requested once. For videos, only the types of data listed in
+        `kinds` are requested.
+
+    """
+    data = {}
+    index = {}
+
+    if video:
+        for identifier in identifiers:
+            html = '{0}/watch?v={1}&hl=en'.format(HOST, identifier)
+            info = '{0}/get_video_info?video_id={1}&hl=en&eurl={0}'.format(HOST, identifier)
+            urls = dict(html=html, info=info)
+            data[identifier] = {kind: urls[kind] for kind in kinds}
+            for kind in kinds:
+                index[urls[kind]] = (identifier, kind)
+
+    if playlist:
+        for identifier in identifiers:
+            info = '{0}/list_ajax?style=json&action_get_list=1&list={1}'.format(HOST, identifier)
+            data[identifier] = info
+            index[info] = (identifier, 'playlist')
+
+    return data, index
+
+
 def get_video_id(url):
     return re.search(r'(?<=[?&]v=)[\w-]+|(?<=be/)[\w-]+|(?<=embed/)[\w-]+', url).group()
+
+
+def get_playlist_id(url):
+    return re.search(r'(?<=[?&]list=)[\w-]+', url).group()
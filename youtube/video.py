@@ -1,10 +1,62 @@
+import concurrent.futures
 import json
 import re
 from html.parser import HTMLParser
 from urllib import parse
 
-from youtube import ciphers
-from youtube.utils import load, get_video_id
+from youtube import ciphers, metrics, utils
+from youtube.aio import load_async
+from youtube.streams import Stream, Streams
+from youtube.utils import Failure, FetchError, load, iter_load, get_video_id, _decode
+
+
+# The patterns to extract the fields from the HTML page, compiled once.
+PATTERNS = {
+    'date': re.compile(r'itemprop="datePublished" content="(.*)">'),
+    'description': re.compile(r'<p id="eow-description" class="" >(.*)</p>'),
+    'category': re.compile(r'"genre" content="(.*)"'),
+    # Two literal patterns are much faster to search than one pattern with the alternation.
+    'standard': re.compile(r'Standard YouTube License'),
+    'creative_commons': re.compile(r'Creative Commons - Attribution'),
+    'likes': re.compile(r'like this video along with (.*) other'),
+    'dislikes': re.compile(r'dislike this video along with (.*) other'),
+    'subscribers': re.compile(r'yt-subscriber-count" title="(.*)" aria-label'),
+    'sts': re.compile(r'"sts":(\d+)'),
+    'js': re.compile(r'"js":"\\/(.*base\.js)"'),
+}
+
+# The same patterns to search the page as bytes, so only the matches are decoded.
+BYTES_PATTERNS = {name: re.compile(pattern.pattern.encode('utf-8'))
+                  for name, pattern in PATTERNS.items()}
+
+# The thumbnails depend only on the video ID.
+THUMBNAIL = 'https://i.ytimg.com/vi/{0}/{1}'
+THUMBNAILS = (('default', 'default.jpg'), ('medium', 'mqdefault.jpg'), ('high', 'hqdefault.jpg'),
+              ('standard', 'sddefault.jpg'), ('maxres', 'maxresdefault.jpg'))
+
+FIELDS = ('title', 'duration', 'date', 'description', 'category', 'license', 'keywords',
+          'statistics', 'channel', 'player', 'streams', 'captions', 'thumbnails')
+
+
+class lazy(object):
+    """Compute the attribute on first access and store the result in the instance.
+
+    The value is stored under the same name, so next accesses do not call the method again.
+    Deleting the attribute makes it computed again on next access.
+
+    """
+
+    def __init__(self, method):
+        self.method = method
+        self.name = method.__name__
+        self.__doc__ = method.__doc__
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = self.method(instance)
+        setattr(instance, self.name, value)
+        return value
 
 
 class Video(object):
@@ -14,62 +66,276 @@ class Video(object):
         url (str): The YouTube video URL.
         identifier (str): The YouTube video ID.
         data (dict): The pre-loaded data.
+        cache (youtube.cache.Cache): The response cache used to load the data.
+        fields (list): The fields that will be used, see `FIELDS`. Only the data needed for these
+            fields is loaded and accessing another field raises `AttributeError`. Default to all
+            fields. If the pre-loaded data lacks the data of some fields, e.g. it was loaded with
+            `load(..., fields=...)`, these fields are left out.
+
+    Raises:
+        youtube.utils.FetchError: If the data could not be loaded, or get_video_info reports
+            that the video is unavailable.
 
     Note:
         If the data has not been loaded previously, specify the `url` or `identifier`.
         Otherwise, specify the `identifier` and `data`.
 
+        The fields are extracted on first access, so unused fields cost nothing.
+        `video.__dict__` extracts all of the available fields. Once all of them are extracted,
+        the responses are released and only the fields are kept.
+
     """
 
-    def __init__(self, url=None, *, identifier=None, data=None):
-        self.title = None
-        self.duration = None
-        self.date = None
-        self.description = None
-        self.category = None
-        self.license = None
-        self.keywords = None
-        self.statistics = None
-        self.channel = None
-        self.player = None
-        self.streams = None
-        self.captions = None
-        self.thumbnails = None
+    def __init__(self, url=None, *, identifier=None, data=None, cache=None, fields=None):
         self.id = None
         self.url = None
+        self.fields = tuple(fields) if fields is not None else None
 
-        self.__init(url, identifier, data)
+        self.__init(url, identifier, data, cache)
 
-    def __init(self, url, identifier, data):
+    def __init(self, url, identifier, data, cache):
         if url is not None:
             self.id = get_video_id(url)
-            data = load([self.id], video=True)
+            data = load([self.id], video=True, cache=cache, fields=self.fields, raw=True)
 
         elif identifier is not None and data is None:
             self.id = identifier
-            data = load([self.id], video=True)
+            data = load([self.id], video=True, cache=cache, fields=self.fields, raw=True)
 
         elif identifier is not None and data is not None:
             self.id = identifier
             data = {identifier: data}
 
-        data = VideoInfoExtractor(self.id, data)
-
-        self.title = data.title()
-        self.duration = data.duration()
-        self.date = data.date()
-        self.description = data.description()
-        self.category = data.category()
-        self.license = data.license()
-        self.keywords = data.keywords()
-        self.statistics = data.statistics()
-        self.channel = data.channel()
-        self.player = data.player()
-        self.streams = data.streams(self.player)
-        self.captions = data.captions()
-        self.thumbnails = data.thumbnails()
+        self._extractor = VideoInfoExtractor(self.id, data)
+
+        # The fields whose data is missing raise AttributeError, like the fields not projected.
+        kinds = {kind for kind, value in data[self.id].items() if value is not None}
+        available = [name for name in FIELDS if kinds.issuperset(utils.SOURCES[name])]
+        if len(available) < len(FIELDS):
+            self.fields = tuple(name for name in available
+                                if self.fields is None or name in self.fields)
+        # The names of the extracted fields, the responses are released once they are all in.
+        self._extracted = set()
+        self._html = self._extractor.html is not None
         self.url = 'https://www.youtube.com/watch?v={0}'.format(self.id)
 
+    @property
+    def __dict__(self):
+        """All fields of the video, e.g. to serialize it with `json.dumps(video.__dict__)`."""
+        fields = self.__getstate__()
+        if fields.get('streams') is not None:
+            fields['streams'] = fields['streams'].as_dict()
+        return fields
+
+    def __getstate__(self):
+        names = FIELDS if self.fields is None else [f for f in FIELDS if f in self.fields]
+        fields = {name: getattr(self, name) for name in names}
+        fields.update(id=self.id, url=self.url)
+        return fields
+
+    def __setstate__(self, state):
+        self.fields = tuple(name for name in FIELDS if name in state)
+        self._extractor = None
+        self._extracted = set(self.fields)
+        self._html = 'html' in utils._kinds(self.fields)
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def _check(self, name):
+        if self.fields is not None and name not in self.fields:
+            raise AttributeError('The {0!r} field was not loaded, add it to `fields` to load '
+                                 'its data.'.format(name))
+
+    def _extract(self, name):
+        self._check(name)
+        with metrics.measure('extract', name):
+            value = getattr(self._extractor, name)()
+        self._extracted.add(name)
+        self._release()
+        return value
+
+    def _release(self):
+        """Drop the responses once all of the fields are extracted."""
+        names = FIELDS if self.fields is None else set(self.fields)
+        if self._extractor is not None and len(self._extracted) >= len(names):
+            self._extractor = None
+
+    @lazy
+    def title(self):
+        return self._extract('title')
+
+    @lazy
+    def duration(self):
+        return self._extract('duration')
+
+    @lazy
+    def date(self):
+        return self._extract('date')
+
+    @lazy
+    def description(self):
+        return self._extract('description')
+
+    @lazy
+    def category(self):
+        return self._extract('category')
+
+    @lazy
+    def license(self):
+        return self._extract('license')
+
+    @lazy
+    def keywords(self):
+        return self._extract('keywords')
+
+    @lazy
+    def statistics(self):
+        return self._extract('statistics')
+
+    @lazy
+    def channel(self):
+        return self._extract('channel')
+
+    @lazy
+    def player(self):
+        return self._extract('player')
+
+    @lazy
+    def streams(self):
+        self._check('streams')
+        with metrics.measure('extract', 'streams'):
+            streams = self._extractor.streams(self._extractor.player())
+        self._extracted.add('streams')
+        self._release()
+        return streams
+
+    @lazy
+    def captions(self):
+        return self._extract('captions')
+
+    @lazy
+    def thumbnails(self):
+        return self._extract('thumbnails')
+
+    @classmethod
+    async def load_async(cls, url=None, *, identifier=None, max_concurrency=100, fields=None):
+        """Asynchronously load the data and create the video.
+
+        Args:
+            url (str): The YouTube video URL.
+            identifier (str): The YouTube video ID.
+            max_concurrency (int): The maximum number of requests in flight at the same time.
+            fields (list): The fields that will be used, see `FIELDS`.
+
+        Example:
+            video = await Video.load_async(identifier='nKIu9yen5nc')
+
+        """
+        if url is not None:
+            identifier = get_video_id(url)
+
+        data = await load_async([identifier], video=True, max_concurrency=max_concurrency,
+                                fields=fields, raw=True)
+        return cls(identifier=identifier, data=data[identifier], fields=fields)
+
+    @classmethod
+    def from_batch(cls, data, workers=None, fields=None, chunksize=8):
+        """Create the videos from the pre-loaded data in a pool of processes.
+
+        Args:
+            data (dict): The pre-loaded data by video ID, as returned by `load`.
+            workers (int): The maximum number of processes. Default to the number of processors.
+            fields (list): The fields that will be used, see `FIELDS`.
+            chunksize (int): The number of videos sent to a process at once.
+
+        Returns:
+            list: The videos in the order of `data`, with the `youtube.utils.Failure` in place
+            of each video whose data could not be loaded or extracted.
+
+        Note:
+            Load the data with `load(..., raw=True)` to send the responses to the processes as
+            bytes, they are decoded and parsed there. Only the extracted fields are sent back.
+            The failed requests stored by `load` are not sent to the processes.
+
+        Example:
+            data = youtube.load(identifiers, video=True, raw=True)
+            videos = youtube.Video.from_batch(data, workers=8)
+
+        """
+        videos = [next((item for item in value.values() if isinstance(item, Failure)), None)
+                  for value in data.values()]
+        items = [(identifier, value, fields) for (identifier, value), failure
+                 in zip(data.items(), videos) if failure is None]
+        positions = (position for position, failure in enumerate(videos) if failure is None)
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            states = executor.map(_extract, items, chunksize=chunksize)
+            for position, state in zip(positions, states):
+                if isinstance(state, Failure):
+                    videos[position] = state
+                    continue
+                video = cls.__new__(cls)
+                video.__setstate__(state)
+                videos[position] = video
+
+        return videos
+
+    def refresh(self, fields=('statistics',)):
+        """Reload the fields, e.g. to poll the statistics, and update them in place.
+
+        Args:
+            fields (list): The fields to reload, see `FIELDS`. Default to 'statistics'.
+
+        Returns:
+            Video: The same video.
+
+        Raises:
+            youtube.utils.FetchError: If the data could not be loaded, the fields are unchanged.
+
+        Note:
+            Only the types of data needed for these fields are requested, see
+            `youtube.utils.SOURCES`. The other fields are kept as they are. The likes of
+            'statistics' and the subscribers of 'channel' are on the watch page, it is requested
+            again if the video was loaded with it, otherwise these values are None.
+
+        """
+        for name in fields:
+            self._check(name)
+
+        data = load([self.id], video=True, fields=self._sources(fields), raw=True)
+        self._refresh(data[self.id], fields)
+        return self
+
+    def _sources(self, fields):
+        """Return the fields whose data is loaded to refresh these fields, None for all."""
+        if not {'statistics', 'channel'}.intersection(fields):
+            return fields
+
+        return None if self._html else fields
+
+    def _refresh(self, data, fields):
+        # Raises FetchError before anything is changed.
+        extractor = VideoInfoExtractor(self.id, {self.id: data})
+
+        previous = {}
+        for name in fields:
+            # The stored value, or the value extracted from the previous data.
+            previous[name] = getattr(self, name)
+            delattr(self, name)
+
+        # The fields are extracted again from the new data, the others keep the previous one.
+        extractor, self._extractor = self._extractor, extractor
+        try:
+            for name in fields:
+                getattr(self, name)
+        except Exception:
+            for name, value in previous.items():
+                setattr(self, name, value)
+            raise
+        finally:
+            self._extractor = extractor
+        self._release()
+
     def best_adaptive(self, fmt='mp4', audio=False, video=False, full=True):
         """Get a best adaptive stream.
 
@@ -85,31 +351,15 @@ class Video(object):
         if fmt not in ('mp4', 'webm', '3gp', 'm4a'):
             return None
 
-        if 'adaptive' in self.streams:
-            _audio = self.streams['adaptive']['audio']
-            _video = self.streams['adaptive']['video']
-
-            def audio_bitrate(itag):
-                if _audio[itag]['type'] == 'audio/{0}'.format(fmt):
-                    return int(_audio[itag]['bitrate'])
-                else:
-                    return 0
-
-            def video_bitrate(itag):
-                if _video[itag]['type'] == 'video/{0}'.format(fmt):
-                    return int(_video[itag]['bitrate'])
-                else:
-                    return 0
-
-            _audio = _audio[max(_audio, key=audio_bitrate)]
-            _video = _video[max(_video, key=video_bitrate)]
+        _audio = self.streams.best('audio', fmt)
+        _video = self.streams.best('video', fmt)
 
-            if audio is True:
-                return _audio
-            elif video is True:
-                return _video
-            elif full is True:
-                return dict(audio=_audio, video=_video)
+        if audio is True:
+            return _audio
+        elif video is True:
+            return _video
+        elif full is True:
+            return dict(audio=_audio, video=_video)
 
     def best_multiplexed(self, fmt='mp4'):
         """Get a best multiplexed stream.
@@ -123,14 +373,150 @@ class Video(object):
         if fmt not in ('mp4', 'webm', '3gp', 'm4a'):
             return None
 
-        if 'multiplexed' in self.streams:
-            itags = ('22', '18', '43', '36', '17')  # Sorted by quality.
-            multiplexed = self.streams['multiplexed']
+        return self.streams.best('multiplexed', fmt)
+
 
-            for itag in itags:
-                if multiplexed.get(itag) is not None:
-                    if multiplexed[itag]['type'] == 'video/{0}'.format(fmt):
-                        return multiplexed[itag]
+def iter_videos(identifiers, max_workers=None, cache=None, fields=None, scheduler=None,
+                unique=False):
+    """Load videos and yield each `Video` as soon as its data has arrived.
+
+    Args:
+        identifiers (iterable): The YouTube video IDs.
+        max_workers (int): The maximum number of threads that can be used to execute the given
+            calls.
+        cache (youtube.cache.Cache): The response cache. Cached responses are not requested.
+        fields (list): The fields that will be used, see `FIELDS`.
+        scheduler (youtube.utils.Scheduler): The scheduler used to send requests.
+        unique (bool): If True, a repeated identifier is loaded once, see
+            `youtube.utils.iter_load`.
+
+    Yields:
+        Video: The video, or the `youtube.utils.Failure` if its data could not be loaded or
+        get_video_info reports that the video is unavailable.
+
+    Note:
+        Each `Video` keeps its raw responses until all of its fields are extracted, e.g. by
+        `video.__dict__` or an exporter, so memory use is bounded by the number of requests in
+        flight and the videos that are not fully extracted yet.
+
+        The fields are still extracted on first access, so a response that lacks a field, e.g.
+        from a change of the pages, raises then rather than here.
+
+    """
+    for identifier, data in iter_load(identifiers, video=True, max_workers=max_workers,
+                                      cache=cache, fields=fields, scheduler=scheduler,
+                                      raw=True, unique=unique):
+        try:
+            video = Video(identifier=identifier, data=data, fields=fields)
+        except FetchError as exception:
+            video = exception.failure
+        yield video
+
+
+def refresh(videos, fields=('statistics',), max_workers=None):
+    """Reload the fields of the videos and update them in place, see `Video.refresh`.
+
+    Args:
+        videos (list): The videos.
+        fields (list): The fields to reload, see `FIELDS`. Default to 'statistics'.
+        max_workers (int): The maximum number of threads that can be used to execute the given
+            calls.
+
+    Returns:
+        list: The `youtube.utils.Failure` for each video that could not be reloaded, their
+        fields are unchanged.
+
+    Example:
+        failures = youtube.refresh(videos, fields=('statistics',))
+
+    """
+    # The videos loaded with the watch page get it again, see `Video.refresh`. The videos with
+    # the same ID share the loaded data.
+    groups = {}
+    for video in videos:
+        for name in fields:
+            video._check(name)
+        sources = video._sources(fields)
+        group = groups.setdefault(None if sources is None else tuple(sources), {})
+        group.setdefault(video.id, []).append(video)
+
+    failures = []
+    for sources, group in groups.items():
+        for identifier, data in iter_load(group, video=True, max_workers=max_workers,
+                                          fields=sources, raw=True):
+            for video in group[identifier]:
+                try:
+                    video._refresh(data, fields)
+                except FetchError as exception:
+                    failures.append(exception.failure)
+                except Exception as exception:
+                    # A field could not be extracted, the other videos are still refreshed.
+                    failures.append(utils._failure(identifier, None, exception))
+
+    return failures
+
+
+def _extract(item):
+    """Extract the fields of the video in a process of `Video.from_batch`."""
+    identifier, data, fields = item
+    try:
+        return Video(identifier=identifier, data=data, fields=fields).__getstate__()
+    except FetchError as exception:
+        return exception.failure
+    except Exception as exception:
+        # Returned rather than raised, so the other videos of the batch are kept.
+        return utils._failure(identifier, None, exception)
+
+
+def _int(value):
+    return int(value) if value is not None else None
+
+
+class DescriptionParser(HTMLParser):
+    """Extract a video description from the HTML. See examples at:
+    https://docs.python.org/3/library/html.parser.html
+
+    """
+
+    truncated = re.compile(r'(?:http|https).*\.\.\.')
+
+    def __init__(self):
+        super().__init__()
+        self.data = []
+        self.urls = []
+
+    def error(self, message):
+        pass
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if 'href' in attrs:
+            href = dict(parse.parse_qsl(attrs['href']))
+
+            if 'q' in href:
+                self.urls.append(href['q'])
+
+            elif '/watch?v' in href:
+                url = 'https://www.youtube.com/watch?v={0}'.format(href['/watch?v'])
+                self.urls.append(url)
+
+            elif 'https://www.youtube.com/playlist?list' in href:
+                identifier = href['https://www.youtube.com/playlist?list']
+                url = 'https://www.youtube.com/playlist?list={0}'.format(identifier)
+                self.urls.append(url)
+
+    def handle_endtag(self, tag):
+        if tag == 'br':
+            self.data.append('\n')
+
+    def handle_data(self, data):
+        try:
+            if self.truncated.match(data):
+                self.data.append(self.urls[-1])
+            else:
+                self.data.append(data)
+        except IndexError:
+            pass
 
 
 class VideoInfoExtractor(object):
@@ -140,16 +526,37 @@ class VideoInfoExtractor(object):
         identifier (str): The YouTube video ID.
         data (dict): The pre-loaded data.
 
+    Raises:
+        youtube.utils.FetchError: If the data could not be loaded, or get_video_info reports
+            that the video is unavailable.
+
     """
 
     def __init__(self, identifier, data):
         self.id = identifier
 
         # Information received from https://www.youtube.com/get_video_info?...
-        self.info = data[self.id]['info']
+        self.info = data[self.id].get('info')
 
         # HTML page https://www.youtube.com/watch?v=...
-        self.html = data[self.id]['html']
+        self.html = data[self.id].get('html')
+
+        for value in (self.info, self.html):
+            if isinstance(value, Failure):
+                raise FetchError(value)
+
+        # The data loaded with `load(..., raw=True)`. The HTML page is searched as bytes.
+        if isinstance(self.info, bytes):
+            self.info = _decode('info', self.info)
+
+        # An unavailable video, e.g. removed or private, has the reason instead of the fields.
+        if self.info is not None and self.info.get('status') == 'fail':
+            _, index = utils._urls([self.id], video=True, playlist=False, kinds=('info',))
+            reason = self.info.get('reason', 'The video is unavailable.')
+            raise FetchError(Failure(self.id, next(iter(index)), None, ValueError(reason), 1))
+
+        # The results of searching the HTML page, see `_search`.
+        self._matches = {}
 
     def title(self):
         return self.info.get('title')
@@ -162,65 +569,22 @@ class VideoInfoExtractor(object):
             return '{:02}:{:02}'.format(seconds % 3600 // 60, seconds % 60)
 
     def date(self):
-        return re.search(r'itemprop="datePublished" content="(.*)">', self.html).group(1)
+        return self._search('date')
 
     def description(self):
-        description = re.search('<p id="eow-description" class="" >(.*)</p>', self.html).group(1)
-        if description == '':
+        description = self._search('description')
+        if not description:
             return None
 
-        class DescriptionParser(HTMLParser):
-            """Extract a video description from the HTML. See examples at:
-            https://docs.python.org/3/library/html.parser.html
-
-            """
-
-            data = []
-            urls = []
-
-            def error(self, message):
-                pass
-
-            def handle_starttag(self, tag, attrs):
-                attrs = dict(attrs)
-                if 'href' in attrs:
-                    href = dict(parse.parse_qsl(attrs['href']))
-
-                    if 'q' in href:
-                        self.urls.append(href['q'])
-
-                    elif '/watch?v' in href:
-                        url = 'https://www.youtube.com/watch?v={0}'.format(href['/watch?v'])
-                        self.urls.append(url)
-
-                    elif 'https://www.youtube.com/playlist?list' in href:
-                        identifier = href['https://www.youtube.com/playlist?list']
-                        url = 'https://www.youtube.com/playlist?list={0}'.format(identifier)
-                        self.urls.append(url)
-
-            def handle_endtag(self, tag):
-                if tag == 'br':
-                    self.data.append('\n')
-
-            def handle_data(self, data):
-                try:
-                    if re.match('(?:http|https).*\.\.\.', data):
-                        self.data.append(self.urls[-1])
-                    else:
-                        self.data.append(data)
-                except IndexError:
-                    pass
-
         parser = DescriptionParser()
         parser.feed(description)
         return ''.join(parser.data)
 
     def category(self):
-        return re.search(r'"genre" content="(.*)"', self.html).group(1)
+        return self._search('category')
 
     def license(self):
-        return re.search(r'Standard YouTube License|Creative Commons - Attribution',
-                         self.html).group()
+        return self._search('standard') or self._search('creative_commons')
 
     def keywords(self):
         keywords = self.info.get('keywords')
@@ -228,14 +592,16 @@ class VideoInfoExtractor(object):
             return keywords.replace(',', ', ')
 
     def statistics(self):
-        likes = re.search(r'like this video along with (.*) other', self.html)
-        dislikes = re.search(r'dislike this video along with (.*) other', self.html)
+        likes, dislikes = None, None
+        if self.html is not None:
+            likes = self._search('likes')
+            dislikes = self._search('dislikes')
         rating = '{:.4}'.format(self.info.get('avg_rating'))
         views = self.info.get('view_count')
 
         if likes and dislikes:
-            likes = likes.group(1).replace(',', '')
-            dislikes = dislikes.group(1).replace(',', '')
+            likes = likes.replace(',', '')
+            dislikes = dislikes.replace(',', '')
 
         if 'allow_ratings' not in self.info:
             likes, dislikes = None, None
@@ -245,98 +611,79 @@ class VideoInfoExtractor(object):
     def channel(self):
         author = self.info.get('author')
         identifier = self.info.get('ucid')
-        subscribers = re.search(r'yt-subscriber-count" title="(.*)" aria-label', self.html)
+        subscribers = self._search('subscribers') if self.html is not None else None
         url = 'https://www.youtube.com/channel/{0}'.format(identifier)
 
-        if subscribers:
-            subscribers = subscribers.group(1)
-
         return dict(title=author, subscribers=subscribers, id=identifier, url=url)
 
     def player(self):
-        sts = re.search(r'"sts":(\d+)', self.html).group(1)
-        url = re.search(r'"js":"\\/(.*base\.js)"', self.html).group(1).replace('\\', '')
-        url = 'https://www.youtube.com/{0}'.format(url)
+        sts = self._search('sts')
+        url = self._search('js').replace('\\', '')
+        url = '{0}/{1}'.format(utils.HOST, url)
 
         return dict(sts=sts, url=url)
 
-    def streams(self, player):
-        streams = dict(adaptive=None, multiplexed=None)
-        cipher = ciphers.get(player)
-
-        if 'adaptive_fmts' in self.info:
-            adaptive = self.info['adaptive_fmts'].split(',')
-            adaptive = [dict(parse.parse_qsl(stream)) for stream in adaptive]
-            adaptive = {stream.pop('itag'): stream for stream in adaptive}
+    def _search(self, name):
+        """Search the HTML page with the pattern from `PATTERNS`.
 
-            audio = {}
-            video = {}
+        Note:
+            Each pattern is searched at most once per page, the result is reused by all
+            methods that need it. If the page is bytes, only the match is decoded.
 
-            for itag, stream in adaptive.items():
-                # Change 'type=...; codecs=...' to {'type': ..., 'codecs': ...}
-                fmt = stream.pop('type').split('; codecs=')
-                stream['type'], stream['codecs'] = fmt[0], fmt[1].replace('\"', '')
-
-                # Disable the rate limit.
-                if 'ratebypass=yes' not in stream['url']:
-                    stream['url'] += '&ratebypass=yes'
-
-                # Decipher the signature.
-                if 's' in stream:
-                    signature = ciphers.decipher(stream.pop('s'), cipher)
-                    stream['url'] += '&signature={0}'.format(signature)
-
-                if 'quality_label' in stream:
-                    video.update({itag: dict(
-                        quality=stream.pop('quality_label'),
-                        bitrate=stream.pop('bitrate'),
-                        fps=stream.pop('fps'),
-                        type=stream.pop('type'),
-                        codecs=stream.pop('codecs'),
-                        size=stream.pop('clen'),
-                        url=stream.pop('url'))
-                    })
-
-                else:
-                    audio.update({itag: dict(
-                        bitrate=stream.pop('bitrate'),
-                        type=stream.pop('type'),
-                        codecs=stream.pop('codecs'),
-                        size=stream.pop('clen'),
-                        url=stream.pop('url'))
-                    })
+        """
+        if name not in self._matches:
+            if isinstance(self.html, bytes):
+                match = BYTES_PATTERNS[name].search(self.html)
+                value = match.group(match.lastindex or 0).decode('utf-8') if match else None
+            else:
+                match = PATTERNS[name].search(self.html)
+                value = match.group(match.lastindex or 0) if match else None
+            self._matches[name] = value
+        return self._matches[name]
 
-            streams['adaptive'] = dict(audio=audio, video=video)
+    def streams(self, player):
+        streams = []
+        cipher = None
 
-        if 'url_encoded_fmt_stream_map' in self.info:
-            multiplexed = self.info['url_encoded_fmt_stream_map'].split(',')
-            multiplexed = [dict(parse.parse_qsl(stream)) for stream in multiplexed]
-            multiplexed = {stream.pop('itag'): stream for stream in multiplexed}
+        for key, kind in (('adaptive_fmts', None), ('url_encoded_fmt_stream_map', 'multiplexed')):
+            if key not in self.info:
+                continue
 
-            streams['multiplexed'] = {}
+            for stream in self.info[key].split(','):
+                stream = dict(parse.parse_qsl(stream))
 
-            for itag, stream in multiplexed.items():
                 # Change 'type=...; codecs=...' to {'type': ..., 'codecs': ...}
-                fmt = stream.pop('type').split('; codecs=')
-                stream['type'], stream['codecs'] = fmt[0], fmt[1].replace('\"', '')
+                fmt, codecs = stream['type'].split('; codecs=')
 
                 # Disable the rate limit.
-                if 'ratebypass=yes' not in stream['url']:
-                    stream['url'] += '&ratebypass=yes'
+                url = stream['url']
+                if 'ratebypass=yes' not in url:
+                    url += '&ratebypass=yes'
 
                 # Decipher the signature.
                 if 's' in stream:
-                    signature = ciphers.decipher(stream.pop('s'), cipher)
-                    stream['url'] += '&signature={0}'.format(signature)
-
-                streams['multiplexed'].update({itag: dict(
-                    quality=stream.pop('quality'),
-                    type=stream.pop('type'),
-                    codecs=stream.pop('codecs'),
-                    url=stream.pop('url'))
-                })
+                    if cipher is None:
+                        cipher = ciphers.get(player)
+                    url += '&signature={0}'.format(ciphers.decipher(stream['s'], cipher))
 
-        return streams
+                if kind == 'multiplexed':
+                    quality = stream.get('quality')
+                else:
+                    quality = stream.get('quality_label')
+
+                streams.append(Stream(
+                    itag=int(stream['itag']),
+                    kind=kind or ('video' if quality is not None else 'audio'),
+                    container=fmt.split('/')[1],
+                    codecs=codecs.replace('\"', ''),
+                    url=url,
+                    quality=quality,
+                    bitrate=_int(stream.get('bitrate')),
+                    fps=_int(stream.get('fps')),
+                    size=_int(stream.get('clen')),
+                ))
+
+        return Streams(streams)
 
     def captions(self):
         player_response = json.loads(self.info['player_response'])
@@ -355,10 +702,4 @@ class VideoInfoExtractor(object):
                 return captions
 
     def thumbnails(self):
-        return {
-            'default': 'https://i.ytimg.com/vi/{0}/default.jpg'.format(self.id),
-            'medium': 'https://i.ytimg.com/vi/{0}/mqdefault.jpg'.format(self.id),
-            'high': 'https://i.ytimg.com/vi/{0}/hqdefault.jpg'.format(self.id),
-            'standard': 'https://i.ytimg.com/vi/{0}/sddefault.jpg'.format(self.id),
-            'maxres': 'https://i.ytimg.com/vi/{0}/maxresdefault.jpg'.format(self.id),
-        }
+        return {name: THUMBNAIL.format(self.id, filename) for name, filename in THUMBNAILS}